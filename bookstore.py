@@ -1,8 +1,31 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json, os
+import io
+import bisect
+import heapq
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import importlib.util
 from dataclasses import dataclass, field
-from typing import Dict, Set, List, Tuple, Optional
+from typing import Callable, Dict, Set, List, Tuple, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+# Numba itself is only imported by load_numba_kernels(), the first time a large data set needs it
+NUMBA_AVAILABLE = NUMPY_AVAILABLE and importlib.util.find_spec("numba") is not None
+numba = None
 
 
 # DATA CLASSES
@@ -20,37 +43,237 @@ class User:
     user_id: str
     name: str
     purchased_books: Set[str] = field(default_factory=set)
+    sorted_books: List[str] = field(default_factory=list)  # purchased_books kept in sorted order
+
+    def __post_init__(self):
+        if not self.sorted_books:
+            self.sorted_books = sorted(self.purchased_books)
 
 
 # RECOMMENDER SYSTEM (COLLABORATIVE FILTERING)
 
 
+_pairwise_jaccard = None
+
+
+def load_numba_kernels() -> bool:
+    """Import Numba and define the compiled kernels on first call; False if Numba can't be imported."""
+    global NUMBA_AVAILABLE, numba, _pairwise_jaccard
+    if _pairwise_jaccard is not None or not NUMBA_AVAILABLE:
+        return NUMBA_AVAILABLE
+    try:
+        import numba
+    except Exception:
+        NUMBA_AVAILABLE = False
+        return False
+
+    @numba.njit(parallel=True, cache=True)
+    def _pairwise_jaccard(M):
+        """All-pairs Jaccard on a (U, B) 0/1 matrix, rows computed in parallel."""
+        U, B = M.shape
+        out = np.zeros((U, U))
+        for i in numba.prange(U):
+            for j in range(U):
+                inter = 0
+                union = 0
+                for k in range(B):
+                    a = M[i, k]
+                    b = M[j, k]
+                    inter += a & b
+                    union += a | b
+                out[i, j] = inter / union if union else 0.0
+        return out
+
+    return True
+
+
+# Below this many user × book cells the bitmask path beats NumPy/Numba setup costs
+NUMPY_MIN_CELLS = 256
+
+
+def _top_k_indices(values, k: int) -> List[int]:
+    """Indices of the k largest positive entries, descending; ties keep index order."""
+    k = min(k, len(values))
+    if k <= 0:
+        return []
+    if k < len(values):
+        # partial selection; keep every tie at the cut-off so index order decides
+        kth = -np.partition(-values, k - 1)[k - 1]
+        idx = np.flatnonzero(values >= kth)
+    else:
+        idx = np.arange(len(values))
+    idx = idx[np.argsort(-values[idx], kind="stable")][:k]
+    return [int(i) for i in idx if values[i] > 0]
+
+
 class RecommenderSystem:
     def __init__(self, users: Dict[str, User], books: Dict[str, Book]):
         self.users = users
         self.books = books
+        self.book_bit: Dict[str, int] = {}
+        self.user_mask: Dict[str, int] = {}
+        self.sizes: Dict[str, int] = {}  # |purchased_books| per user, kept in step with user_mask
+        self.user_ids: List[str] = []
+        self.user_index: Dict[str, int] = {}
+        self.book_ids: List[str] = []  # inverse of book_bit, i.e. matrix column -> book_id
+        self.M = None  # (U, B) uint8 purchase matrix, rebuilt lazily after mutation
+        self.row_sums = None
+        self.bits = None  # (U, ceil(B/64)) uint64 packed bitsets, rebuilt with M
+        self.pairwise = None  # (U, U) similarity matrix, dropped with M
+        self._sim_cache: Dict[Tuple[str, int], List[Tuple[User, float]]] = {}
+        self._rec_cache: Dict[Tuple[str, int], List[Tuple[Book, float]]] = {}
+        self.mode = "py"  # "py" (bitmasks) or "np" (matrix kernels), chosen from the data size
+        self._lock = threading.RLock()  # GUI worker threads share the caches below
+        self.rebuild_masks()
+
+    # BITSET HELPERS
+
+    def mask_for(self, book_ids: Set[str]) -> int:
+        """Pack a set of book ids into an int bitmask (unseen ids get a new bit)."""
+        mask = 0
+        for bid in book_ids:
+            bit = self.book_bit.get(bid)
+            if bit is None:
+                bit = self.book_bit[bid] = len(self.book_bit)
+            mask |= 1 << bit
+        return mask
+
+    def rebuild_masks(self) -> None:
+        """Assign every book a bit position and rebuild all user bitmasks."""
+        with self._lock:
+            self.book_bit = {bid: i for i, bid in enumerate(self.books)}
+            self.user_mask = {uid: self.mask_for(u.purchased_books) for uid, u in self.users.items()}
+            self.sizes = {uid: mask.bit_count() for uid, mask in self.user_mask.items()}
+            self.invalidate()
+
+    def update_user_mask(self, user_id: str) -> None:
+        """Rebuild the bitmask of one user after their purchases changed."""
+        with self._lock:
+            mask = self.user_mask[user_id] = self.mask_for(self.users[user_id].purchased_books)
+            self.sizes[user_id] = mask.bit_count()
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop cached similarities/recommendations and derived matrices after a data change."""
+        with self._lock:
+            self._sim_cache.clear()
+            self._rec_cache.clear()
+            big = len(self.users) * len(self.books) >= NUMPY_MIN_CELLS
+            self.mode = "np" if NUMPY_AVAILABLE and big else "py"
+            self.M = None
+            self.bits = None
+            self.pairwise = None
+
+    def build_matrix(self):
+        """Build the (U, B) uint8 user × book purchase matrix from the bitmasks."""
+        self.user_ids = list(self.users)
+        self.user_index = {uid: i for i, uid in enumerate(self.user_ids)}
+        self.book_ids = list(self.book_bit)
+        self.M = np.zeros((len(self.user_ids), len(self.book_bit)), dtype=np.uint8)
+        for i, uid in enumerate(self.user_ids):
+            self.M[i, [self.book_bit[bid] for bid in self.users[uid].purchased_books]] = 1
+        self.row_sums = self.M.sum(axis=1, dtype=np.int32)
+        return self.M
+
+    def build_bits(self):
+        """Pack each user's bitmask into 64-bit words, one row per user in user_ids order."""
+        words = (len(self.book_bit) + 63) // 64
+        raw = b"".join(self.user_mask[uid].to_bytes(words * 8, "little") for uid in self.user_ids)
+        self.bits = np.frombuffer(raw, dtype="<u8").reshape(len(self.user_ids), words)
+        return self.bits
+
+    def pairwise_similarity(self):
+        """(U, U) Jaccard matrix for every user pair, cached until the data changes."""
+        with self._lock:
+            if self.pairwise is None:
+                M = self.build_matrix() if self.M is None else self.M
+                if load_numba_kernels():
+                    self.pairwise = _pairwise_jaccard(M)
+                elif hasattr(np, "bitwise_count"):
+                    # NumPy 2.0+: popcount over packed words moves 8x fewer bytes than the uint8 matrix
+                    bits = self.build_bits()
+                    card = self.row_sums
+                    self.pairwise = np.zeros((len(bits), len(bits)))
+                    for i in range(len(bits)):
+                        inter = np.bitwise_count(bits[i] & bits).sum(axis=1, dtype=np.int32)
+                        union = card[i] + card - inter
+                        np.divide(inter, union, out=self.pairwise[i], where=union > 0)
+                else:
+                    Mi = M.astype(np.int32)
+                    inter = Mi @ Mi.T
+                    union = self.row_sums[:, None] + self.row_sums[None, :] - inter
+                    self.pairwise = np.divide(inter, union, out=np.zeros(inter.shape), where=union > 0)
+            return self.pairwise
 
     @staticmethod
-    def jaccard_similarity(a: Set[str], b: Set[str]) -> float:
-        """Jaccard = |A ∩ B| / |A ∪ B|"""
-        if not a and not b:
-            return 0.0
-        inter = len(a & b)
-        union = len(a | b)
+    def jaccard_similarity(ma: int, mb: int, size_a: Optional[int] = None, size_b: Optional[int] = None) -> float:
+        """Jaccard = |A ∩ B| / (|A| + |B| - |A ∩ B|) on bitmasks; pass cached sizes to skip their popcounts."""
+        inter = (ma & mb).bit_count()
+        if size_a is None:
+            size_a = ma.bit_count()
+        if size_b is None:
+            size_b = mb.bit_count()
+        union = size_a + size_b - inter
         return inter / union if union else 0.0
 
+    def set_counts(self, target_user_id: str) -> List[Tuple[str, int, int, int]]:
+        """(other_id, |A ∩ B|, |A ∪ B|, |A − B|) for every other user, without building any sets."""
+        with self._lock:
+            if self.mode == "np":
+                M = self.build_matrix() if self.M is None else self.M
+                ti = self.user_index[target_user_id]
+                inter = M @ M[ti].astype(np.int32)
+                size_t = int(self.row_sums[ti])
+                union = self.row_sums + size_t - inter
+                return [
+                    (oid, int(inter[i]), int(union[i]), size_t - int(inter[i]))
+                    for i, oid in enumerate(self.user_ids)
+                    if i != ti
+                ]
+            target_mask = self.user_mask[target_user_id]
+            size_t = self.sizes[target_user_id]
+            counts: List[Tuple[str, int, int, int]] = []
+            for oid in self.users:
+                if oid == target_user_id:
+                    continue
+                inter = (target_mask & self.user_mask[oid]).bit_count()
+                counts.append((oid, inter, size_t + self.sizes[oid] - inter, size_t - inter))
+            return counts
+
+    def jaccard_sets(self, a: Set[str], b: Set[str]) -> float:
+        """Set-based Jaccard, kept for callers that still hold plain sets."""
+        return self.jaccard_similarity(self.mask_for(a), self.mask_for(b))
+
     def most_similar_users(self, target_user_id: str, top_k: int = 3) -> List[Tuple[User, float]]:
         """Find top-k users most similar to target using Jaccard on purchased_books."""
-        target = self.users[target_user_id]
+        key = (target_user_id, top_k)
+        with self._lock:
+            cached = self._sim_cache.get(key)
+            if cached is None:
+                cached = self._sim_cache[key] = self._compute_similar_users(target_user_id, top_k)
+        return cached
+
+    def _compute_similar_users(self, target_user_id: str, top_k: int) -> List[Tuple[User, float]]:
+        if self.mode == "np":
+            return self._most_similar_users_np(target_user_id, top_k)
+        target_mask = self.user_mask[target_user_id]
+        target_size = self.sizes[target_user_id]
         sims: List[Tuple[User, float]] = []
         for uid, user in self.users.items():
             if uid == target_user_id:
                 continue
-            sim = self.jaccard_similarity(target.purchased_books, user.purchased_books)
+            sim = self.jaccard_similarity(target_mask, self.user_mask[uid], target_size, self.sizes[uid])
             if sim > 0:
                 sims.append((user, sim))
-        sims.sort(key=lambda x: x[1], reverse=True)
-        return sims[:top_k]
+        return heapq.nlargest(top_k, sims, key=lambda x: x[1])
+
+    def _most_similar_users_np(self, target_user_id: str, top_k: int) -> List[Tuple[User, float]]:
+        """Vectorized most_similar_users: reads the target's row of the pairwise matrix."""
+        pairwise = self.pairwise_similarity()
+        ti = self.user_index[target_user_id]
+        sims = pairwise[ti].copy()
+        sims[ti] = 0.0
+        return [(self.users[self.user_ids[i]], float(sims[i])) for i in _top_k_indices(sims, top_k)]
 
     def recommend_books(self, target_user_id: str, max_recs: int = 5) -> List[Tuple[Book, float]]:
         """
@@ -59,24 +282,50 @@ class RecommenderSystem:
         - Collect their books not owned by target
         - Weight by similarity
         """
+        key = (target_user_id, max_recs)
+        with self._lock:
+            cached = self._rec_cache.get(key)
+            if cached is None:
+                cached = self._rec_cache[key] = self._compute_recommendations(target_user_id, max_recs)
+        return cached
+
+    def _compute_recommendations(self, target_user_id: str, max_recs: int) -> List[Tuple[Book, float]]:
+        if self.mode == "np":
+            return self._recommend_books_np(target_user_id, max_recs)
         target = self.users[target_user_id]
         similar_users = self.most_similar_users(target_user_id)
-        score_map: Dict[str, float] = {}
+        score_map: Dict[str, float] = defaultdict(float)
 
         for user, sim in similar_users:
             for book_id in user.purchased_books:
                 if book_id in target.purchased_books:
                     continue
-                score_map[book_id] = score_map.get(book_id, 0.0) + sim
+                score_map[book_id] += sim
 
-        ranked = sorted(score_map.items(), key=lambda x: x[1], reverse=True)
+        ranked = heapq.nlargest(max_recs, score_map.items(), key=lambda x: x[1])
         recs: List[Tuple[Book, float]] = []
-        for bid, score in ranked[:max_recs]:
+        for bid, score in ranked:
             book = self.books.get(bid)
             if book:
                 recs.append((book, score))
         return recs
 
+    def _recommend_books_np(self, target_user_id: str, max_recs: int) -> List[Tuple[Book, float]]:
+        """Vectorized recommend_books: book scores are one vector-matrix product sim_vec @ M."""
+        similar_users = self.most_similar_users(target_user_id)
+        ti = self.user_index[target_user_id]
+        sim_vec = np.zeros(len(self.user_ids))
+        for user, sim in similar_users:
+            sim_vec[self.user_index[user.user_id]] = sim
+        scores = sim_vec @ self.M
+        scores[self.M[ti].astype(bool)] = 0.0
+        recs: List[Tuple[Book, float]] = []
+        for col in _top_k_indices(scores, max_recs):
+            book = self.books.get(self.book_ids[col])
+            if book:
+                recs.append((book, float(scores[col])))
+        return recs
+
     def time_complexity_string(self) -> str:
         U = len(self.users)
         B = len(self.books)
@@ -109,18 +358,35 @@ def get_data_paths() -> Tuple[str, str]:
     return os.path.join(base, "users.json"), os.path.join(base, "books.json")
 
 
+def read_json(path: str):
+    """Parse a JSON file, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: str, payload) -> None:
+    """Write payload as 2-space indented JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
 def save_users_json(users_data: List[Dict], path: Optional[str] = None) -> None:
     if path is None:
         path, _ = get_data_paths()
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"users": users_data}, f, indent=2)
+    write_json(path, {"users": users_data})
 
 
 def save_books_json(books_data: List[Dict], path: Optional[str] = None) -> None:
     if path is None:
         _, path = get_data_paths()
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"books": books_data}, f, indent=2)
+    write_json(path, {"books": books_data})
 
 
 def load_data() -> Tuple[Dict[str, User], Dict[str, Book], str]:
@@ -129,8 +395,7 @@ def load_data() -> Tuple[Dict[str, User], Dict[str, Book], str]:
 
     # Load users
     try:
-        with open(users_path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        raw = read_json(users_path)
         if isinstance(raw, dict) and "users" in raw:
             users_data = raw["users"]
         elif isinstance(raw, list):
@@ -144,8 +409,7 @@ def load_data() -> Tuple[Dict[str, User], Dict[str, Book], str]:
 
     # Load books
     try:
-        with open(books_path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        raw = read_json(books_path)
         if isinstance(raw, dict) and "books" in raw:
             books_data = raw["books"]
         elif isinstance(raw, list):
@@ -176,22 +440,53 @@ def load_data() -> Tuple[Dict[str, User], Dict[str, Book], str]:
     return users, books, "\n".join(msg_parts)
 
 
-def save_all(users: Dict[str, User], books: Dict[str, Book]) -> None:
-    users_data = [
-        {
-            "user_id": u.user_id,
-            "name": u.name,
-            "purchased_books": sorted(list(u.purchased_books)),
-        }
-        for u in users.values()
-    ]
-    books_data = [
-        {"book_id": b.book_id, "title": b.title, "genre": b.genre}
-        for b in books.values()
-    ]
+def save_all(
+    users: Dict[str, User],
+    books: Dict[str, Book],
+    save_users: bool = True,
+    save_books: bool = True,
+) -> None:
+    """Write users.json and/or books.json; pass False to skip a file that has not changed."""
     upath, bpath = get_data_paths()
-    save_users_json(users_data, upath)
-    save_books_json(books_data, bpath)
+    if save_users:
+        users_data = [
+            {
+                "user_id": u.user_id,
+                "name": u.name,
+                "purchased_books": list(u.sorted_books),
+            }
+            for u in users.values()
+        ]
+        save_users_json(users_data, upath)
+    if save_books:
+        books_data = [
+            {"book_id": b.book_id, "title": b.title, "genre": b.genre}
+            for b in books.values()
+        ]
+        save_books_json(books_data, bpath)
+
+
+# GUI STYLE (shared by every widget built in BookstoreGUI)
+
+
+FONT_TITLE = ("Segoe UI", 20, "bold")
+FONT_HEADING = ("Segoe UI", 14, "bold")
+FONT_LIST = ("Segoe UI", 12)
+FONT_SECTION = ("Segoe UI", 11, "bold")
+FONT_LBL = ("Segoe UI", 10)
+FONT_LBL_BOLD = ("Segoe UI", 10, "bold")
+FONT_MONO = ("Consolas", 11)
+FONT_NODE_ID = ("Segoe UI", 9, "bold")
+FONT_NODE_NAME = ("Segoe UI", 8)
+
+BTN_STYLE = {
+    "font": FONT_SECTION,
+    "fg": "white",
+    "bg": "#00b4d8",
+    "activebackground": "#0096c7",
+    "bd": 0,
+    "height": 2,
+}
 
 
 # GUI
@@ -203,6 +498,14 @@ class BookstoreGUI:
         self.rec = recommender
         self.users = users
         self.books = books
+        # ids edited since the last save, so SAVE TO JSON only rewrites files that changed
+        self.dirty_users: Set[str] = set()
+        self.dirty_books: Set[str] = set()
+        # output line -> other user id while the SET OPERATIONS view is shown
+        self.set_rows: Dict[int, str] = {}
+        self.set_rows_user: Optional[str] = None
+        # heavy views compute off the Tk thread; widgets are only touched from poll callbacks
+        self.pool = ThreadPoolExecutor(max_workers=2)
 
         root.title("Book Recommendation System")
         root.geometry("1300x750")  # large fixed size
@@ -216,7 +519,7 @@ class BookstoreGUI:
         title = tk.Label(
             self.root,
             text="BOOK RECOMMENDER SYSTEM",
-            font=("Segoe UI", 20, "bold"),
+            font=FONT_TITLE,
             fg="white",
             bg="#1a1a1a",
         )
@@ -229,13 +532,13 @@ class BookstoreGUI:
         left = tk.Frame(main, bg="#222222", bd=2, relief="ridge")
         left.pack(side="left", fill="y", padx=(0, 10))
 
-        tk.Label(left, text="Users", font=("Segoe UI", 14, "bold"), fg="white", bg="#222222").pack(pady=5)
+        tk.Label(left, text="Users", font=FONT_HEADING, fg="white", bg="#222222").pack(pady=5)
 
         self.user_list = tk.Listbox(
             left,
             width=28,
             height=18,
-            font=("Segoe UI", 12),
+            font=FONT_LIST,
             bg="#333333",
             fg="white",
             selectbackground="#00b4d8",
@@ -244,23 +547,16 @@ class BookstoreGUI:
         )
         self.user_list.pack(padx=10, pady=5)
 
-        for uid, user in sorted(self.users.items()):
-            self.user_list.insert("end", f"{uid}: {user.name}")
+        # user ids / book ids in listbox order, so selections never need to parse the row text
+        self.user_list_ids: List[str] = sorted(self.users)
+        self.user_books_ids: List[str] = []
+        self.user_list.insert("end", *[f"{uid}: {self.users[uid].name}" for uid in self.user_list_ids])
 
         btn_frame = tk.Frame(left, bg="#222222")
         btn_frame.pack(padx=10, pady=10, fill="x")
 
-        btn_style = {
-            "font": ("Segoe UI", 11, "bold"),
-            "fg": "white",
-            "bg": "#00b4d8",
-            "activebackground": "#0096c7",
-            "bd": 0,
-            "height": 2,
-        }
-
         def add_btn(text, cmd):
-            b = tk.Button(btn_frame, text=text, command=cmd, **btn_style)
+            b = tk.Button(btn_frame, text=text, command=cmd, **BTN_STYLE)
             b.pack(fill="x", pady=3)
             return b
 
@@ -277,16 +573,17 @@ class BookstoreGUI:
         right = tk.Frame(main, bg="#222222", bd=2, relief="ridge")
         right.pack(side="left", fill="both", expand=True)
 
-        tk.Label(right, text="Output", font=("Segoe UI", 14, "bold"), fg="white", bg="#222222").pack(pady=5)
+        tk.Label(right, text="Output", font=FONT_HEADING, fg="white", bg="#222222").pack(pady=5)
 
         self.output = tk.Text(
             right,
             bg="#333333",
             fg="white",
-            font=("Consolas", 11),
+            font=FONT_MONO,
             insertbackground="white",
         )
         self.output.pack(fill="both", expand=True, padx=10, pady=(5, 0))
+        self.output.bind("<Double-Button-1>", self.expand_set_row)
 
         # EDITING AREA (bottom)
         edit = tk.Frame(self.root, bg="#1a1a1a")
@@ -298,20 +595,20 @@ class BookstoreGUI:
             text="Add / Edit User",
             fg="white",
             bg="#1a1a1a",
-            font=("Segoe UI", 11, "bold"),
+            font=FONT_SECTION,
             labelanchor="n",
         )
         user_edit.pack(side="left", fill="x", expand=True, padx=5)
 
-        tk.Label(user_edit, text="User ID:", fg="white", bg="#1a1a1a", font=("Segoe UI", 10)).grid(
+        tk.Label(user_edit, text="User ID:", fg="white", bg="#1a1a1a", font=FONT_LBL).grid(
             row=0, column=0, sticky="e", padx=3, pady=2
         )
-        tk.Label(user_edit, text="Name:", fg="white", bg="#1a1a1a", font=("Segoe UI", 10)).grid(
+        tk.Label(user_edit, text="Name:", fg="white", bg="#1a1a1a", font=FONT_LBL).grid(
             row=1, column=0, sticky="e", padx=3, pady=2
         )
 
-        self.entry_user_id = tk.Entry(user_edit, font=("Segoe UI", 10), width=15)
-        self.entry_user_name = tk.Entry(user_edit, font=("Segoe UI", 10), width=20)
+        self.entry_user_id = tk.Entry(user_edit, font=FONT_LBL, width=15)
+        self.entry_user_name = tk.Entry(user_edit, font=FONT_LBL, width=20)
         self.entry_user_id.grid(row=0, column=1, padx=3, pady=2)
         self.entry_user_name.grid(row=1, column=1, padx=3, pady=2)
 
@@ -319,7 +616,7 @@ class BookstoreGUI:
             user_edit,
             text="Add / Update User",
             command=self.add_update_user,
-            font=("Segoe UI", 10, "bold"),
+            font=FONT_LBL_BOLD,
             bg="#00b4d8",
             fg="white",
             bd=0,
@@ -331,24 +628,24 @@ class BookstoreGUI:
             text="Add / Edit Book",
             fg="white",
             bg="#1a1a1a",
-            font=("Segoe UI", 11, "bold"),
+            font=FONT_SECTION,
             labelanchor="n",
         )
         book_edit.pack(side="left", fill="x", expand=True, padx=5)
 
-        tk.Label(book_edit, text="Book ID:", fg="white", bg="#1a1a1a", font=("Segoe UI", 10)).grid(
+        tk.Label(book_edit, text="Book ID:", fg="white", bg="#1a1a1a", font=FONT_LBL).grid(
             row=0, column=0, sticky="e", padx=3, pady=2
         )
-        tk.Label(book_edit, text="Title:", fg="white", bg="#1a1a1a", font=("Segoe UI", 10)).grid(
+        tk.Label(book_edit, text="Title:", fg="white", bg="#1a1a1a", font=FONT_LBL).grid(
             row=1, column=0, sticky="e", padx=3, pady=2
         )
-        tk.Label(book_edit, text="Genre:", fg="white", bg="#1a1a1a", font=("Segoe UI", 10)).grid(
+        tk.Label(book_edit, text="Genre:", fg="white", bg="#1a1a1a", font=FONT_LBL).grid(
             row=2, column=0, sticky="e", padx=3, pady=2
         )
 
-        self.entry_book_id = tk.Entry(book_edit, font=("Segoe UI", 10), width=10)
-        self.entry_book_title = tk.Entry(book_edit, font=("Segoe UI", 10), width=18)
-        self.entry_book_genre = tk.Entry(book_edit, font=("Segoe UI", 10), width=12)
+        self.entry_book_id = tk.Entry(book_edit, font=FONT_LBL, width=10)
+        self.entry_book_title = tk.Entry(book_edit, font=FONT_LBL, width=18)
+        self.entry_book_genre = tk.Entry(book_edit, font=FONT_LBL, width=12)
         self.entry_book_id.grid(row=0, column=1, padx=3, pady=2)
         self.entry_book_title.grid(row=1, column=1, padx=3, pady=2)
         self.entry_book_genre.grid(row=2, column=1, padx=3, pady=2)
@@ -357,7 +654,7 @@ class BookstoreGUI:
             book_edit,
             text="Add / Update Book",
             command=self.add_update_book,
-            font=("Segoe UI", 10, "bold"),
+            font=FONT_LBL_BOLD,
             bg="#00b4d8",
             fg="white",
             bd=0,
@@ -369,35 +666,35 @@ class BookstoreGUI:
             text="Edit Purchases for Selected User",
             fg="white",
             bg="#1a1a1a",
-            font=("Segoe UI", 11, "bold"),
+            font=FONT_SECTION,
             labelanchor="n",
         )
         purchase_edit.pack(side="left", fill="x", expand=True, padx=5)
 
-        tk.Label(purchase_edit, text="Add Book ID:", fg="white", bg="#1a1a1a", font=("Segoe UI", 10)).grid(
+        tk.Label(purchase_edit, text="Add Book ID:", fg="white", bg="#1a1a1a", font=FONT_LBL).grid(
             row=0, column=0, sticky="e", padx=3, pady=2
         )
-        self.entry_purchase_book_id = tk.Entry(purchase_edit, font=("Segoe UI", 10), width=10)
+        self.entry_purchase_book_id = tk.Entry(purchase_edit, font=FONT_LBL, width=10)
         self.entry_purchase_book_id.grid(row=0, column=1, padx=3, pady=2)
 
         tk.Button(
             purchase_edit,
             text="Add Purchase",
             command=self.add_purchase,
-            font=("Segoe UI", 10, "bold"),
+            font=FONT_LBL_BOLD,
             bg="#00b4d8",
             fg="white",
             bd=0,
         ).grid(row=0, column=2, padx=5, pady=2)
 
-        tk.Label(purchase_edit, text="User's Books:", fg="white", bg="#1a1a1a", font=("Segoe UI", 10)).grid(
+        tk.Label(purchase_edit, text="User's Books:", fg="white", bg="#1a1a1a", font=FONT_LBL).grid(
             row=1, column=0, columnspan=3, sticky="w", padx=3
         )
 
         self.user_books_list = tk.Listbox(
             purchase_edit,
             height=4,
-            font=("Segoe UI", 10),
+            font=FONT_LBL,
             bg="#333333",
             fg="white",
             selectbackground="#00b4d8",
@@ -411,7 +708,7 @@ class BookstoreGUI:
             purchase_edit,
             text="Remove Selected",
             command=self.remove_purchase,
-            font=("Segoe UI", 10, "bold"),
+            font=FONT_LBL_BOLD,
             bg="#e63946",
             fg="white",
             bd=0,
@@ -426,7 +723,7 @@ class BookstoreGUI:
         tk.Label(
             bottom,
             text="Time complexity: " + self.rec.time_complexity_string(),
-            font=("Segoe UI", 10),
+            font=FONT_LBL,
             fg="white",
             bg="#1a1a1a",
         ).pack(side="left")
@@ -435,38 +732,55 @@ class BookstoreGUI:
 
     def get_selected_user_id(self) -> Optional[str]:
         try:
-            idx = self.user_list.curselection()
-            if not idx:
-                return None
-            item = self.user_list.get(idx[0])
-            return item.split(":", 1)[0].strip()
+            sel = self.user_list.curselection()
+            return self.user_list_ids[sel[0]] if sel else None
         except Exception:
             return None
 
+    def run_in_background(self, compute: Callable, render: Callable) -> None:
+        """Run compute() on the worker pool and pass its result to render() on the Tk thread."""
+        fut = self.pool.submit(compute)
+
+        def poll():
+            if not fut.done():
+                self.root.after(15, poll)
+                return
+            try:
+                result = fut.result()
+            except Exception as e:
+                messagebox.showerror("Error", f"Computation failed:\n{e}")
+                return
+            render(result)
+
+        self.root.after(0, poll)
+
     def set_output(self, text: str) -> None:
+        self.set_rows = {}
         self.output.delete("1.0", "end")
         self.output.insert("end", text)
 
     def refresh_user_listbox(self):
+        self.user_list_ids = sorted(self.users)
+        items = [f"{uid}: {self.users[uid].name}" for uid in self.user_list_ids]
         self.user_list.delete(0, "end")
-        for uid, user in sorted(self.users.items()):
-            self.user_list.insert("end", f"{uid}: {user.name}")
+        self.user_list.insert("end", *items)
         self.refresh_user_books_list()
 
     def refresh_user_books_list(self):
         self.user_books_list.delete(0, "end")
+        self.user_books_ids = []
         uid = self.get_selected_user_id()
         if not uid:
             return
         user = self.users.get(uid)
         if not user:
             return
-        for bid in sorted(user.purchased_books):
+        self.user_books_ids = list(user.sorted_books)
+        items = []
+        for bid in self.user_books_ids:
             book = self.books.get(bid)
-            if book:
-                self.user_books_list.insert("end", f"{bid}: {book.title}")
-            else:
-                self.user_books_list.insert("end", f"{bid}: (Unknown)")
+            items.append(f"{bid}: {book.title}" if book else f"{bid}: (Unknown)")
+        self.user_books_list.insert("end", *items)
 
     #  CORE ACTIONS
 
@@ -479,17 +793,18 @@ class BookstoreGUI:
         if not user:
             messagebox.showerror("Error", "User not found in data.")
             return
-        lines = [f"User: {user.name} ({user.user_id})", "", "Purchased books:"]
+        buf = io.StringIO()
+        buf.write(f"User: {user.name} ({user.user_id})\n\nPurchased books:\n")
         if not user.purchased_books:
-            lines.append("  (none)")
+            buf.write("  (none)\n")
         else:
-            for bid in sorted(user.purchased_books):
+            for bid in user.sorted_books:
                 book = self.books.get(bid)
                 if book:
-                    lines.append(f"  - {book.title} [{book.genre}] (id={book.book_id})")
+                    buf.write(f"  - {book.title} [{book.genre}] (id={book.book_id})\n")
                 else:
-                    lines.append(f"  - Unknown book (id={bid})")
-        self.set_output("\n".join(lines))
+                    buf.write(f"  - Unknown book (id={bid})\n")
+        self.set_output(buf.getvalue())
 
     def show_recommendations(self):
         uid = self.get_selected_user_id()
@@ -501,18 +816,25 @@ class BookstoreGUI:
         except KeyError:
             messagebox.showerror("Error", "Internal data error while recommending.")
             return
-        lines = [f"Recommendations for {self.users[uid].name} ({uid})", "", "Recommended books:"]
+        buf = io.StringIO()
+        buf.write(f"Recommendations for {self.users[uid].name} ({uid})\n\nRecommended books:\n")
         if not recs:
-            lines.append("  (no recommendations available; maybe no similar users)")
+            buf.write("  (no recommendations available; maybe no similar users)\n")
         else:
             for book, score in recs:
-                lines.append(f"  - {book.title} [{book.genre}]  score={score:.3f}")
-        self.set_output("\n".join(lines))
+                buf.write(f"  - {book.title} [{book.genre}]  score={score:.3f}\n")
+        self.set_output(buf.getvalue())
 
     def save_data_clicked(self):
+        if not self.dirty_users and not self.dirty_books:
+            messagebox.showinfo("Saved", "No changes since the last save.")
+            return
+        files = [name for name, dirty in (("users.json", self.dirty_users), ("books.json", self.dirty_books)) if dirty]
         try:
-            save_all(self.users, self.books)
-            messagebox.showinfo("Saved", "Data saved to users.json and books.json.")
+            save_all(self.users, self.books, save_users=bool(self.dirty_users), save_books=bool(self.dirty_books))
+            self.dirty_users.clear()
+            self.dirty_books.clear()
+            messagebox.showinfo("Saved", f"Data saved to {' and '.join(files)}.")
         except Exception as e:
             messagebox.showerror("Save error", f"Could not save data:\n{e}")
 
@@ -520,10 +842,11 @@ class BookstoreGUI:
 
     def show_graph(self):
         """Show dictionary mapping: user_id -> purchased_books set."""
-        lines = ["USER → BOOK RELATIONSHIPS (dictionary mapping)", ""]
+        buf = io.StringIO()
+        buf.write("USER → BOOK RELATIONSHIPS (dictionary mapping)\n\n")
         for uid, user in self.users.items():
-            lines.append(f"{uid}: {sorted(list(user.purchased_books))}")
-        self.set_output("\n".join(lines))
+            buf.write(f"{uid}: {user.sorted_books}\n")
+        self.set_output(buf.getvalue())
 
     def show_sets(self):
         """Show set operations between selected user and others."""
@@ -532,19 +855,36 @@ class BookstoreGUI:
             messagebox.showwarning("No user", "Select a user first.")
             return
         user = self.users[uid]
-        lines = [f"Set operations for {user.name} ({uid})", ""]
-        for other_id, other in self.users.items():
-            if other_id == uid:
-                continue
-            inter = user.purchased_books & other.purchased_books
-            union = user.purchased_books | other.purchased_books
-            diff = user.purchased_books - other.purchased_books
-            lines.append(f"Compared with {other.name} ({other_id}):")
-            lines.append(f"  ∩ (intersection, common books): {sorted(list(inter))}")
-            lines.append(f"  ∪ (union, all distinct books): {sorted(list(union))}")
-            lines.append(f"  − (books only {user.name} has): {sorted(list(diff))}")
-            lines.append("")
-        self.set_output("\n".join(lines))
+        buf = io.StringIO()
+        buf.write(f"Set operations for {user.name} ({uid})\n")
+        buf.write("Sizes of ∩ (common), ∪ (all distinct) and − (only this user). Double-click a row for the books.\n\n")
+        rows: Dict[int, str] = {}
+        line = 4  # Text widget lines are 1-based; three header lines above
+        for other_id, inter, union, diff in self.rec.set_counts(uid):
+            buf.write(f"{other_id} ({self.users[other_id].name}):  ∩={inter}  ∪={union}  −={diff}\n")
+            rows[line] = other_id
+            line += 1
+        self.set_output(buf.getvalue())
+        self.set_rows = rows
+        self.set_rows_user = uid
+
+    def expand_set_row(self, event=None):
+        """Append the book lists for the set-operations row under the cursor."""
+        if not self.set_rows or event is None:
+            return
+        line = int(self.output.index(f"@{event.x},{event.y}").split(".")[0])
+        other_id = self.set_rows.get(line)
+        if other_id is None:
+            return
+        user = self.users[self.set_rows_user]
+        other = self.users[other_id]
+        buf = io.StringIO()
+        buf.write(f"\nCompared with {other.name} ({other_id}):\n")
+        buf.write(f"  ∩ (intersection, common books): {sorted(user.purchased_books & other.purchased_books)}\n")
+        buf.write(f"  ∪ (union, all distinct books): {sorted(user.purchased_books | other.purchased_books)}\n")
+        buf.write(f"  − (books only {user.name} has): {sorted(user.purchased_books - other.purchased_books)}\n")
+        self.output.insert("end", buf.getvalue())
+        self.output.see("end")
 
     def show_similarity(self):
         """Show Jaccard similarity between selected user and all others."""
@@ -552,13 +892,25 @@ class BookstoreGUI:
         if not uid:
             messagebox.showwarning("No user", "Select a user first.")
             return
-        lines = [f"Jaccard similarity for {uid} vs. other users", ""]
-        for other_id, other in self.users.items():
-            if other_id == uid:
-                continue
-            sim = self.rec.jaccard_similarity(self.users[uid].purchased_books, other.purchased_books)
-            lines.append(f"{uid} ↔ {other_id}: {sim:.3f}")
-        self.set_output("\n".join(lines))
+
+        # snapshot masks and sizes on the Tk thread: the edit actions change users and masks while the worker runs
+        rec = self.rec
+        with rec._lock:
+            target = (rec.user_mask[uid], rec.sizes[uid])
+            others = [(oid, rec.user_mask[oid], rec.sizes[oid]) for oid in self.users if oid != uid]
+
+        def compute() -> List[Tuple[str, float]]:
+            mask, size = target
+            return [(oid, rec.jaccard_similarity(mask, m, size, n)) for oid, m, n in others]
+
+        self.run_in_background(compute, lambda rows: self._render_similarity(uid, rows))
+
+    def _render_similarity(self, uid: str, rows: List[Tuple[str, float]]) -> None:
+        buf = io.StringIO()
+        buf.write(f"Jaccard similarity for {uid} vs. other users\n\n")
+        for other_id, sim in rows:
+            buf.write(f"{uid} ↔ {other_id}: {sim:.3f}\n")
+        self.set_output(buf.getvalue())
 
     def show_cf_logic(self):
         """Explain the collaborative filtering steps for the selected user."""
@@ -566,33 +918,38 @@ class BookstoreGUI:
         if not uid:
             messagebox.showwarning("No user", "Select a user first.")
             return
+        top_k = len(self.users) - 1
+        self.run_in_background(
+            lambda: self.rec.most_similar_users(uid, top_k=top_k),
+            lambda sims: self._render_cf_logic(uid, sims),
+        )
+
+    def _render_cf_logic(self, uid: str, sims: List[Tuple[User, float]]) -> None:
         user = self.users[uid]
-        lines = [f"Collaborative filtering explanation for {user.name} ({uid})", ""]
-        lines.append("1) Compute Jaccard similarity with all other users:")
-        sims = self.rec.most_similar_users(uid, top_k=len(self.users) - 1)
+        buf = io.StringIO()
+        buf.write(f"Collaborative filtering explanation for {user.name} ({uid})\n\n")
+        buf.write("1) Compute Jaccard similarity with all other users:\n")
         for other, sim in sims:
-            lines.append(f"   - {other.user_id} ({other.name}): similarity={sim:.3f}")
-        lines.append("")
-        lines.append("2) Collect books from similar users that this user hasn't bought,")
-        lines.append("   and weight them by similarity score.")
-        score_map: Dict[str, float] = {}
+            buf.write(f"   - {other.user_id} ({other.name}): similarity={sim:.3f}\n")
+        buf.write("\n2) Collect books from similar users that this user hasn't bought,\n")
+        buf.write("   and weight them by similarity score.\n")
+        score_map: Dict[str, float] = defaultdict(float)
         for other, sim in sims:
             for bid in other.purchased_books:
                 if bid in user.purchased_books:
                     continue
-                score_map[bid] = score_map.get(bid, 0.0) + sim
+                score_map[bid] += sim
         if not score_map:
-            lines.append("   No extra books found from similar users.")
+            buf.write("   No extra books found from similar users.\n")
         else:
             for bid, score in sorted(score_map.items(), key=lambda x: x[1], reverse=True):
                 book = self.books.get(bid)
                 if book:
-                    lines.append(f"   - {book.title} (id={bid}) score={score:.3f}")
+                    buf.write(f"   - {book.title} (id={bid}) score={score:.3f}\n")
                 else:
-                    lines.append(f"   - Unknown book id={bid}, score={score:.3f}")
-        lines.append("")
-        lines.append("3) Recommend the highest scoring books (see 'RECOMMEND BOOKS' button).")
-        self.set_output("\n".join(lines))
+                    buf.write(f"   - Unknown book id={bid}, score={score:.3f}\n")
+        buf.write("\n3) Recommend the highest scoring books (see 'RECOMMEND BOOKS' button).\n")
+        self.set_output(buf.getvalue())
 
     def show_network_graph(self):
         """
@@ -604,55 +961,77 @@ class BookstoreGUI:
         if not self.users or not self.books:
             messagebox.showinfo("No data", "No users or books to display.")
             return
+        # snapshot on the Tk thread: the edit actions mutate users and their purchases while the layout runs
+        users = sorted((uid, u.name, tuple(u.purchased_books)) for uid, u in self.users.items())
+        books = sorted((bid, b.title) for bid, b in self.books.items())
+        self.run_in_background(lambda: self._network_layout(users, books, 800, 500), self._render_network_graph)
+
+    def _network_layout(
+        self,
+        users: List[Tuple[str, str, Tuple[str, ...]]],
+        books: List[Tuple[str, str]],
+        canvas_width: int,
+        canvas_height: int,
+    ) -> Dict:
+        """Node positions and edge endpoints for the network graph from (id, name, books) / (id, title) snapshots."""
+        user_y_step = canvas_height / (len(users) + 1)
+        book_y_step = canvas_height / (len(books) + 1)
+        user_y = {uid: user_y_step * idx for idx, (uid, _, _) in enumerate(users, start=1)}
+        book_y = {bid: book_y_step * idx for idx, (bid, _) in enumerate(books, start=1)}
+        edges = [
+            (user_y[uid], book_y[bid])
+            for uid, _, purchased in users
+            for bid in purchased
+            if bid in book_y
+        ]
+        return {
+            "width": canvas_width,
+            "height": canvas_height,
+            "user_x": canvas_width * 0.25,
+            "book_x": canvas_width * 0.75,
+            "users": [(uid, name, user_y[uid]) for uid, name, _ in users],
+            "books": [(bid, title, book_y[bid]) for bid, title in books],
+            "edges": edges,
+        }
 
+    def _render_network_graph(self, layout: Dict) -> None:
         top = tk.Toplevel(self.root)
         top.title("User–Book Network Graph")
 
-        canvas_width = 800
-        canvas_height = 500
-        cv = tk.Canvas(top, width=canvas_width, height=canvas_height, bg="#1a1a1a", highlightthickness=0)
+        cv = tk.Canvas(top, width=layout["width"], height=layout["height"], bg="#1a1a1a", highlightthickness=0)
         cv.pack(fill="both", expand=True)
 
-        user_x = canvas_width * 0.25
-        book_x = canvas_width * 0.75
-        user_y_step = canvas_height / (len(self.users) + 1)
-        book_y_step = canvas_height / (len(self.books) + 1)
-
-        user_pos: Dict[str, Tuple[float, float]] = {}
-        book_pos: Dict[str, Tuple[float, float]] = {}
-
+        user_x = layout["user_x"]
+        book_x = layout["book_x"]
         r = 18
+        create_line = cv.create_line
+        create_oval = cv.create_oval
+        create_rectangle = cv.create_rectangle
+        create_text = cv.create_text
+
+        # Draw edges (purchases) first so they sit behind the nodes
+        ux, bx = user_x + r, book_x - r
+        for uy, by in layout["edges"]:
+            create_line(ux, uy, bx, by, fill="#aaaaaa")
 
         # Draw user nodes
-        for idx, (uid, user) in enumerate(sorted(self.users.items()), start=1):
-            y = user_y_step * idx
-            user_pos[uid] = (user_x, y)
-            cv.create_oval(user_x - r, y - r, user_x + r, y + r, fill="#00b4d8", outline="#eeeeee")
-            cv.create_text(user_x, y - 28, text=uid, fill="white", font=("Segoe UI", 9, "bold"))
-            cv.create_text(user_x, y + 28, text=user.name, fill="#dddddd", font=("Segoe UI", 8))
+        for uid, name, y in layout["users"]:
+            create_oval(user_x - r, y - r, user_x + r, y + r, fill="#00b4d8", outline="#eeeeee")
+            create_text(user_x, y - 28, text=uid, fill="white", font=FONT_NODE_ID)
+            create_text(user_x, y + 28, text=name, fill="#dddddd", font=FONT_NODE_NAME)
 
         # Draw book nodes
-        for idx, (bid, book) in enumerate(sorted(self.books.items()), start=1):
-            y = book_y_step * idx
-            book_pos[bid] = (book_x, y)
-            cv.create_rectangle(book_x - r, y - r, book_x + r, y + r, fill="#ffd166", outline="#333333")
-            cv.create_text(book_x, y - 28, text=bid, fill="white", font=("Segoe UI", 9, "bold"))
-            cv.create_text(book_x, y + 28, text=book.title, fill="#dddddd", font=("Segoe UI", 8), width=160)
-
-        # Draw edges (purchases)
-        for uid, user in self.users.items():
-            ux, uy = user_pos[uid]
-            for bid in user.purchased_books:
-                if bid in book_pos:
-                    bx, by = book_pos[bid]
-                    cv.create_line(ux + r, uy, bx - r, by, fill="#aaaaaa")
+        for bid, title, y in layout["books"]:
+            create_rectangle(book_x - r, y - r, book_x + r, y + r, fill="#ffd166", outline="#333333")
+            create_text(book_x, y - 28, text=bid, fill="white", font=FONT_NODE_ID)
+            create_text(book_x, y + 28, text=title, fill="#dddddd", font=FONT_NODE_NAME, width=160)
 
         info = tk.Label(
             top,
             text="Blue circles = Users, Yellow squares = Books, Lines = Purchases",
             fg="white",
             bg="#1a1a1a",
-            font=("Segoe UI", 10),
+            font=FONT_LBL,
         )
         info.pack(pady=4)
 
@@ -666,9 +1045,12 @@ class BookstoreGUI:
             return
         if uid in self.users:
             self.users[uid].name = name
+            self.dirty_users.add(uid)
             messagebox.showinfo("Updated", f"Updated user {uid}.")
         else:
             self.users[uid] = User(user_id=uid, name=name, purchased_books=set())
+            self.rec.update_user_mask(uid)
+            self.dirty_users.add(uid)
             messagebox.showinfo("Added", f"Added new user {uid}.")
         self.refresh_user_listbox()
 
@@ -683,9 +1065,12 @@ class BookstoreGUI:
             b = self.books[bid]
             b.title = title
             b.genre = genre
+            self.dirty_books.add(bid)
             messagebox.showinfo("Updated", f"Updated book {bid}.")
         else:
             self.books[bid] = Book(book_id=bid, title=title, genre=genre)
+            self.rec.rebuild_masks()
+            self.dirty_books.add(bid)
             messagebox.showinfo("Added", f"Added new book {bid}.")
         self.refresh_user_books_list()
 
@@ -706,6 +1091,9 @@ class BookstoreGUI:
             messagebox.showinfo("Already there", f"User already has book {bid}.")
             return
         user.purchased_books.add(bid)
+        bisect.insort(user.sorted_books, bid)
+        self.rec.update_user_mask(uid)
+        self.dirty_users.add(uid)
         self.refresh_user_books_list()
         messagebox.showinfo("Added", "Book added to user's purchases.")
 
@@ -718,11 +1106,13 @@ class BookstoreGUI:
         if not sel:
             messagebox.showwarning("No selection", "Select a book from the user's list.")
             return
-        item = self.user_books_list.get(sel[0])
-        bid = item.split(":", 1)[0].strip()
+        bid = self.user_books_ids[sel[0]]
         user = self.users[uid]
         if bid in user.purchased_books:
             user.purchased_books.remove(bid)
+            del user.sorted_books[bisect.bisect_left(user.sorted_books, bid)]
+            self.rec.update_user_mask(uid)
+            self.dirty_users.add(uid)
             self.refresh_user_books_list()
             messagebox.showinfo("Removed", "Book removed from user's purchases.")
         else:
@@ -4,9 +4,14 @@ import requests
 import math
 import webbrowser
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from itertools import permutations
+from collections import OrderedDict
 import json
 import os
+import hashlib
+import importlib.util
 
 try:
     from PIL import Image, ImageTk
@@ -14,6 +19,16 @@ try:
 except Exception:
     PIL_AVAILABLE = False
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
+
+# Numba itself is only imported by load_numba_kernels(), the first time a large route needs it
+NUMBA_AVAILABLE = NUMPY_AVAILABLE and importlib.util.find_spec("numba") is not None
+numba = None
+
 from io import BytesIO
 
 
@@ -66,84 +81,426 @@ def geocode_postcode(query, api_key=None):
         return None, debug
 
 
-def haversine(a, b):
-    """Return distance in KM between (lat, lon) points."""
+def haversine_vec(cur_rad, pts_rad):
+    """Return distances in KM between broadcastable (..., 2) arrays of (lat, lon) points in radians."""
     R = 6371
-    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
-    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
-    dlat, dlon = lat2 - lat1, lon2 - lon1
-    x = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    return R * 2 * math.atan2(math.sqrt(x), math.sqrt(1 - x))
+    sh_lat = np.sin((pts_rad[..., 0] - cur_rad[..., 0]) * 0.5)
+    sh_lon = np.sin((pts_rad[..., 1] - cur_rad[..., 1]) * 0.5)
+    x = sh_lat * sh_lat + np.cos(cur_rad[..., 0]) * np.cos(pts_rad[..., 0]) * sh_lon * sh_lon
+    return R * 2 * np.arcsin(np.sqrt(np.minimum(1.0, x)))
+
+
+def haversine_pairwise(a_rad, b_rad):
+    """Return the (len(a), len(b)) matrix of distances in KM between two (N, 2) radian arrays."""
+    return haversine_vec(a_rad[:, None, :], b_rad[None, :, :])
+
+
+def distance_matrix(lats_rad, lons_rad):
+    """Return the pairwise distance table for parallel latitude/longitude sequences in radians; node 0 is the start."""
+    if NUMPY_AVAILABLE:
+        rad = np.column_stack((lats_rad, lons_rad)).astype(float)
+        return haversine_pairwise(rad, rad)
+    # plain scalars in parallel lists: no per-pair call, tuple unpacking or repeated cos(lat)
+    lats_rad = list(lats_rad)
+    lons_rad = list(lons_rad)
+    cos_lats = [math.cos(lat) for lat in lats_rad]
+    n = len(lats_rad)
+    D = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        lat1, lon1, cos_lat1 = lats_rad[i], lons_rad[i], cos_lats[i]
+        row = D[i]
+        for j in range(i + 1, n):
+            sh_lat = math.sin((lats_rad[j] - lat1) * 0.5)
+            sh_lon = math.sin((lons_rad[j] - lon1) * 0.5)
+            x = sh_lat * sh_lat + cos_lat1 * cos_lats[j] * sh_lon * sh_lon
+            d = 6371 * 2 * math.asin(math.sqrt(min(1.0, x)))
+            row[j] = d
+            D[j][i] = d
+    return D
+
+
+#  Compiled kernels (used when Numba is installed and the route is big enough to repay compiling)
+
+# Exact solvers only switch to Numba from this many stops; below it the first-run compile costs more than it saves
+NUMBA_MIN_POINTS = 8
+_bf_tour = None
+_held_karp = None
+
+
+def load_numba_kernels():
+    """Import Numba and define the compiled kernels on first call; False if Numba can't be imported."""
+    global NUMBA_AVAILABLE, numba, _bf_tour, _held_karp
+    if _bf_tour is not None or not NUMBA_AVAILABLE:
+        return NUMBA_AVAILABLE
+    try:
+        import numba
+    except Exception:
+        NUMBA_AVAILABLE = False
+        return False
+
+    @numba.njit(parallel=True, cache=True)
+    def _bf_tour(D):
+        """Exhaustive search; each choice of first stop walks its own Heap's-algorithm permutations in parallel."""
+        n = len(D)
+        m = n - 1
+        best_totals = np.full(m, np.inf)
+        best_orders = np.zeros((m, m), dtype=np.int64)
+        for f in numba.prange(m):
+            first = f + 1
+            rest = np.empty(m - 1, dtype=np.int64)
+            r = 0
+            for i in range(1, n):
+                if i != first:
+                    rest[r] = i
+                    r += 1
+            c = np.zeros(m - 1, dtype=np.int64)
+            i = 0
+            evaluate = True
+            while True:
+                # a tour and its reverse are the same length, so only walk the one ending on a later stop
+                if evaluate and m > 1 and rest[m - 2] < first:
+                    evaluate = False
+                if evaluate:
+                    total = D[0, first]
+                    current = first
+                    pruned = False
+                    for idx in range(m - 1):
+                        total += D[current, rest[idx]]
+                        # the partial tour is already no better than this bucket's best
+                        if total >= best_totals[f]:
+                            pruned = True
+                            break
+                        current = rest[idx]
+                    if not pruned:
+                        total += D[current, 0]
+                        if total < best_totals[f]:
+                            best_totals[f] = total
+                            best_orders[f, 0] = first
+                            best_orders[f, 1:] = rest
+                    evaluate = False
+                if i >= m - 1:
+                    break
+                if c[i] < i:
+                    if i % 2 == 0:
+                        rest[0], rest[i] = rest[i], rest[0]
+                    else:
+                        rest[c[i]], rest[i] = rest[i], rest[c[i]]
+                    c[i] += 1
+                    i = 0
+                    evaluate = True
+                else:
+                    c[i] = 0
+                    i += 1
+        f = np.argmin(best_totals)
+        return best_orders[f], best_totals[f]
+
+    @numba.njit(cache=True)
+    def _held_karp(D):
+        """Held-Karp DP over stops 1..n-1; returns the parent table, the final stop and the tour length."""
+        m = len(D) - 1
+        full = (1 << m) - 1
+        dp = np.full((1 << m, m), np.inf)
+        parent = np.full((1 << m, m), -1, dtype=np.int8)
+        for k in range(m):
+            dp[1 << k, k] = D[0, k + 1]
+        for S in range(1, full + 1):
+            for k in range(m):
+                if (S >> k) & 1 == 0 or S == (1 << k):
+                    continue
+                prev = S ^ (1 << k)
+                best_d = np.inf
+                best = -1
+                for j in range(m):
+                    if (prev >> j) & 1:
+                        d = dp[prev, j] + D[j + 1, k + 1]
+                        if d < best_d:
+                            best_d = d
+                            best = j
+                dp[S, k] = best_d
+                parent[S, k] = best
+        last = 0
+        best_distance = np.inf
+        for k in range(m):
+            d = dp[full, k] + D[k + 1, 0]
+            if d < best_distance:
+                best_distance = d
+                last = k
+        return parent, last, best_distance
+
+    return True
 
 
 #  Algorithm Classes
 
+# Above this many stops the optimal tour comes from Held-Karp instead of enumerating permutations
+BRUTE_FORCE_MAX_POINTS = 8
+# Held-Karp's tables hold 2^N * N entries: 16 stops is about a million, each extra stop doubles it
+HELD_KARP_MAX_POINTS = 16
+
+
+def _bf_bucket(D, first, stops, bound):
+    """Best tour whose first stop is fixed, or (bound, None) if none beats bound."""
+    rest = [i for i in stops if i != first]
+    best_order = None
+    best_distance = bound
+
+    for tail in permutations(rest):
+        # distances are symmetric: skip each tour's mirror image, keeping the one ending on a later stop
+        if tail and first > tail[-1]:
+            continue
+        current = first
+        total = D[0][first]
+        for i in tail:
+            total += D[current][i]
+            if total >= best_distance:
+                break
+            current = i
+        else:
+            total += D[current][0]
+            if total < best_distance:
+                best_distance = total
+                best_order = (first,) + tail
+
+    return best_distance, best_order
+
 class NearestNeighbourAlgorithm:
-    """Compute nearest neighbour order and distance."""
-    def compute(self, start, points):
-        unvisited = list(range(len(points)))
-        current = start
+    """Compute nearest neighbour order and distance from a distance matrix (node 0 is the start)."""
+    def compute(self, D):
+        if NUMPY_AVAILABLE and isinstance(D, np.ndarray):
+            return self.compute_vectorized(D)
+        alive = [True] * len(D)
+        alive[0] = False
+        current = 0
+        order = []
+        total = 0
+
+        for _ in range(len(D) - 1):
+            row = D[current]
+            best = min((i for i in range(1, len(D)) if alive[i]), key=row.__getitem__)
+            order.append(best - 1)
+            total += row[best]
+            alive[best] = False
+            current = best
+
+        total += D[current][0]
+        return order, total
+
+    def compute_vectorized(self, D):
+        """Same tour as compute(), but each step scans the current row of D in one NumPy call."""
+        alive = np.ones(len(D), dtype=bool)
+        alive[0] = False
+        current = 0
         order = []
         total = 0
 
-        while unvisited:
-            best = None
-            best_d = 10**9
-            for i in unvisited:
-                d = haversine(current, (points[i][0], points[i][1]))
-                if d < best_d:
-                    best_d = d
-                    best = i
-            order.append(best)
-            total += best_d
-            current = (points[best][0], points[best][1])
-            unvisited.remove(best)
-
-        total += haversine(current, start)
+        for _ in range(len(D) - 1):
+            d = np.where(alive, D[current], np.inf)
+            best = int(d.argmin())
+            order.append(best - 1)
+            total += float(d[best])
+            alive[best] = False
+            current = best
+
+        total += float(D[current, 0])
         return order, total
 
 
 class BruteForceAlgorithm:
-    """Compute brute-force TSP solution."""
-    def compute(self, start, points):
-        best_order = None
-        best_distance = 10**9
-
-        for perm in permutations(range(len(points))):
-            current = start
-            total = 0
-            for i in perm:
-                p = (points[i][0], points[i][1])
-                total += haversine(current, p)
-                current = p
-            total += haversine(current, start)
+    """Compute brute-force TSP solution from a distance matrix (node 0 is the start)."""
+    def compute(self, D):
+        if len(D) - 1 >= NUMBA_MIN_POINTS and load_numba_kernels():
+            order, total = _bf_tour(np.asarray(D, dtype=float))
+            return [int(i) - 1 for i in order], float(total)
+        # plain lists index faster than ndarray elements in a Python loop
+        D = D.tolist() if hasattr(D, "tolist") else D
+        # try close first stops first so a short tour is found early and prunes the rest
+        stops = sorted(range(1, len(D)), key=D[0].__getitem__)
+
+        results = []
+        bound = 10**9
+        for first in stops:
+            results.append(_bf_bucket(D, first, stops, bound))
+            bound = results[-1][0]
+
+        best_distance, best_order = min((r for r in results if r[1] is not None), key=lambda r: r[0])
+        return [i - 1 for i in best_order], best_distance
+
+
+class HeldKarpAlgorithm:
+    """Compute the optimal tour with Held-Karp dynamic programming, O(N^2 * 2^N)."""
+    def compute(self, D):
+        if len(D) - 1 > HELD_KARP_MAX_POINTS:
+            raise ValueError(f"Held-Karp supports at most {HELD_KARP_MAX_POINTS} stops, got {len(D) - 1}")
+        if len(D) - 1 >= NUMBA_MIN_POINTS and load_numba_kernels():
+            parent, last, total = _held_karp(np.asarray(D, dtype=float))
+            return self.reconstruct(parent, (1 << (len(D) - 1)) - 1, last), float(total)
+        if NUMPY_AVAILABLE:
+            return self.compute_vectorized(np.asarray(D, dtype=float))
+        m = len(D) - 1
+        full = (1 << m) - 1
+        INF = float("inf")
+        # dp[S][k]: shortest path from the start through subset S of stops, ending at stop k
+        dp = [[INF] * m for _ in range(1 << m)]
+        parent = [[-1] * m for _ in range(1 << m)]
+        for k in range(m):
+            dp[1 << k][k] = D[0][k + 1]
+
+        for S in range(1, full + 1):
+            for k in range(m):
+                if not S >> k & 1 or S == 1 << k:
+                    continue
+                prev = S ^ (1 << k)
+                row = dp[prev]
+                best_d = INF
+                best = -1
+                for j in range(m):
+                    if prev >> j & 1:
+                        d = row[j] + D[j + 1][k + 1]
+                        if d < best_d:
+                            best_d = d
+                            best = j
+                dp[S][k] = best_d
+                parent[S][k] = best
+
+        best_distance = INF
+        last = -1
+        for k in range(m):
+            d = dp[full][k] + D[k + 1][0]
+            if d < best_distance:
+                best_distance = d
+                last = k
+        return self.reconstruct(parent, full, last), best_distance
+
+    def compute_vectorized(self, D):
+        """Same recurrence as compute(), relaxing every end stop of a subset in one NumPy call."""
+        m = len(D) - 1
+        full = (1 << m) - 1
+        C = D[1:, 1:]
+        stops = np.arange(m)
+        dp = np.full((1 << m, m), np.inf)
+        parent = np.full((1 << m, m), -1, dtype=np.int8)
+        dp[1 << stops, stops] = D[0, 1:]
+
+        for S in range(1, full + 1):
+            ks = stops[(S >> stops) & 1 == 1]
+            if len(ks) < 2:
+                continue
+            # row r: paths over S without ks[r], extended to ks[r]; invalid ends are already inf
+            cand = dp[S ^ (1 << ks)] + C[:, ks].T
+            best = cand.argmin(axis=1)
+            dp[S, ks] = cand[np.arange(len(ks)), best]
+            parent[S, ks] = best
+
+        closing = dp[full] + D[1:, 0]
+        last = int(closing.argmin())
+        return self.reconstruct(parent, full, last), float(closing[last])
+
+    @staticmethod
+    def reconstruct(parent, S, last):
+        """Walk the parent table back from the final stop to recover the visiting order."""
+        order = []
+        k = last
+        while k != -1:
+            order.append(k)
+            prev = int(parent[S][k])
+            S ^= 1 << k
+            k = prev
+        order.reverse()
+        return order
 
-            if total < best_distance:
-                best_distance = total
-                best_order = perm
 
-        return list(best_order), best_distance
+GEOCODE_CACHE_FILE = "geocode_cache.json"
+# Google lookups run concurrently; Nominatim's usage policy allows one request per second
+GOOGLE_GEOCODE_WORKERS = 8
+NOMINATIM_MIN_INTERVAL = 1.0
 
 
 class Geocoder:
+    """Geocode queries, remembering successful lookups per provider in memory and in GEOCODE_CACHE_FILE."""
+    MAX_CACHED = 256
+    _cache = None   # shared by every instance: "provider|QUERY" -> [lat, lon, address], oldest first
+    _dirty = False
+    _lock = threading.Lock()
+    _rate_lock = threading.Lock()
+    _next_request = 0.0  # earliest time.monotonic() for the next Nominatim request
+
     def __init__(self, api_key):
         self.api_key = api_key
+        self.provider = "google" if api_key else "nominatim"
+        self.max_workers = GOOGLE_GEOCODE_WORKERS if api_key else 1
+        with Geocoder._lock:
+            if Geocoder._cache is None:
+                Geocoder._cache = self.load_cache()
+
+    @staticmethod
+    def load_cache():
+        if not os.path.exists(GEOCODE_CACHE_FILE):
+            return OrderedDict()
+        try:
+            with open(GEOCODE_CACHE_FILE) as f:
+                return OrderedDict(json.load(f))
+        except Exception:
+            return OrderedDict()
+
+    def save_cache(self):
+        """Write the cache to disk if any lookup added to it since the last save."""
+        with Geocoder._lock:
+            if not Geocoder._dirty:
+                return
+            data = dict(Geocoder._cache)
+            Geocoder._dirty = False
+        try:
+            with open(GEOCODE_CACHE_FILE, "w") as f:
+                json.dump(data, f)
+        except OSError:
+            pass
 
     def geocode(self, q):
-        return geocode_postcode(q, self.api_key)
+        key = f"{self.provider}|{q.strip().upper()}"
+        with Geocoder._lock:
+            hit = Geocoder._cache.get(key)
+            if hit is not None:
+                Geocoder._cache.move_to_end(key)
+                return hit[0], hit[1], hit[2], {"query": q, "provider": self.provider, "cached": True}
+
+        if self.provider == "nominatim":
+            with Geocoder._rate_lock:
+                wait = Geocoder._next_request - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                Geocoder._next_request = time.monotonic() + NOMINATIM_MIN_INTERVAL
+
+        g = geocode_postcode(q, self.api_key)
+        # failures are not cached: they are often transient (timeouts, rate limits)
+        if g and g[0] is not None:
+            with Geocoder._lock:
+                Geocoder._cache[key] = [g[0], g[1], g[2]]
+                if len(Geocoder._cache) > self.MAX_CACHED:
+                    Geocoder._cache.popitem(last=False)
+                Geocoder._dirty = True
+        return g
+
+
+MAP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "road_smart")
 
 
 class MapPreview:
+    """Fetch static map images, reusing them from memory or MAP_CACHE_DIR when the stops are unchanged."""
     def __init__(self, pil_available):
         self.pil_available = pil_available
+        self.cache = {}  # (start, ((lat, lon), ...)) -> PIL image
 
-    def generate(self, start, points):
-        if not self.pil_available:
+    def generate(self, start, lats, lons):
+        if not self.pil_available or start is None:
             return None
 
+        key = (tuple(start), tuple(zip(map(float, lats), map(float, lons))))
+        if key in self.cache:
+            return self.cache[key]
+
         base = "https://staticmap.openstreetmap.de/staticmap.php"
         markers = [f"{start[0]},{start[1]},red"]
-        markers += [f"{p[0]},{p[1]},blue" for p in points]
+        markers += [f"{lat},{lon},blue" for lat, lon in zip(lats, lons)]
 
         params = {
             "center": f"{start[0]},{start[1]}",
@@ -152,57 +509,82 @@ class MapPreview:
             "markers": "|".join(markers)
         }
 
+        path = os.path.join(MAP_CACHE_DIR, f"map_{hashlib.sha1(repr(key).encode()).hexdigest()[:16]}.png")
         try:
-            r = requests.get(base, params=params, timeout=10)
-            r.raise_for_status()
-            return Image.open(BytesIO(r.content))
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    content = f.read()
+            else:
+                r = requests.get(base, params=params, timeout=10)
+                r.raise_for_status()
+                content = r.content
+                try:
+                    os.makedirs(MAP_CACHE_DIR, exist_ok=True)
+                    with open(path, "wb") as f:
+                        f.write(content)
+                except OSError:
+                    pass
+            img = Image.open(BytesIO(content))
         except:
             return None
 
+        self.cache[key] = img
+        return img
+
+
+# Route graph canvases are created at this fixed size, so drawing never has to ask Tk for it
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 400
+
 
 class GraphDrawer:
     """Draw a geographic-style graph: nodes placed by lat/lon, edges as arrows with distances."""
-    def draw(self, canvas, labels, coords, edges, highlight=True):
+    def draw(self, canvas, labels, lats, lons, edges, highlight=True, w=CANVAS_WIDTH, h=CANVAS_HEIGHT):
         canvas.delete("all")
-        if not labels or not coords or len(labels) != len(coords):
+        if not labels or len(labels) != len(lats):
             return
 
         # compute bounds
-        lats = [c[0] for c in coords]
-        lons = [c[1] for c in coords]
-        min_lat, max_lat = min(lats), max(lats)
-        min_lon, max_lon = min(lons), max(lons)
+        if NUMPY_AVAILABLE:
+            lats = np.asarray(lats, dtype=float)
+            lons = np.asarray(lons, dtype=float)
+            min_lat, max_lat = lats.min(), lats.max()
+            min_lon, max_lon = lons.min(), lons.max()
+        else:
+            min_lat, max_lat = min(lats), max(lats)
+            min_lon, max_lon = min(lons), max(lons)
 
-        w = int(canvas["width"])
-        h = int(canvas["height"])
         margin = 30
 
         # avoid division by zero if all lats/lons are same
         lat_span = max(max_lat - min_lat, 1e-9)
         lon_span = max(max_lon - min_lon, 1e-9)
 
-        def to_canvas(lat, lon):    
-            x = margin + (lon - min_lon) / lon_span * (w - 2 * margin)
-            # invert lat so north is up
-            y = margin + (max_lat - lat) / lat_span * (h - 2 * margin)
-            return x, y
+        # map every node to canvas space at once; invert lat so north is up
+        if NUMPY_AVAILABLE:
+            xs = (margin + (lons - min_lon) / lon_span * (w - 2 * margin)).tolist()
+            ys = (margin + (max_lat - lats) / lat_span * (h - 2 * margin)).tolist()
+        else:
+            xs = [margin + (lon - min_lon) / lon_span * (w - 2 * margin) for lon in lons]
+            ys = [margin + (max_lat - lat) / lat_span * (h - 2 * margin) for lat in lats]
+
+        create_oval = canvas.create_oval
+        create_text = canvas.create_text
+        create_line = canvas.create_line
 
-        positions = {}
-        for i, (label, (lat, lon)) in enumerate(zip(labels, coords)):
-            x, y = to_canvas(lat, lon)
-            positions[i] = (x, y)
-            canvas.create_oval(x-15, y-15, x+15, y+15,
-                               fill="#ff7043" if i == 0 else "#4aa3ff")
-            canvas.create_text(x, y-22, text=label, fill="black")
+        for i, (label, x, y) in enumerate(zip(labels, xs, ys)):
+            create_oval(x-15, y-15, x+15, y+15,
+                        fill="#ff7043" if i == 0 else "#4aa3ff")
+            create_text(x, y-22, text=label, fill="black")
 
         line_color = "#2e7d32" if highlight else "#999999"
         for (i, j, d) in edges:
-            x1, y1 = positions[i]
-            x2, y2 = positions[j]
-            canvas.create_line(x1, y1, x2, y2, fill=line_color, width=2,
-                               arrow=tk.LAST, arrowshape=(12, 15, 6))
+            x1, y1 = xs[i], ys[i]
+            x2, y2 = xs[j], ys[j]
+            create_line(x1, y1, x2, y2, fill=line_color, width=2,
+                        arrow=tk.LAST, arrowshape=(12, 15, 6))
             mx, my = (x1 + x2) / 2, (y1 + y2) / 2
-            canvas.create_text(mx, my, text=f"{d:.1f} km", fill="red")
+            create_text(mx, my, text=f"{d:.1f} km", fill="red")
 
 
 
@@ -222,15 +604,20 @@ class App(tk.Tk):
             pass
 
         self.start_loc = None
-        self.points = None
+        # destinations as parallel arrays: lats[i], lons[i], names[i]
+        self.lats = None
+        self.lons = None
+        self.names = None
         self.order_nn = None
         self.order_bf = None
         self.map_img = None
+        self.map_preview = MapPreview(PIL_AVAILABLE)  # kept so repeat previews hit its cache
         self.point_labels = None
         self.destinations_raw = []   # list of postcode strings
         self.labels_raw = []         # list of label strings (same length as destinations_raw)
 
         self.logo_img = None  # holder for logo image
+        self.cancel_event = None  # set to abandon the compute run in flight
 
         self.create_widgets()
 
@@ -315,6 +702,9 @@ class App(tk.Tk):
         ttk.Button(f_in, text="Example", command=self.load_example).grid(row=6, column=0, pady=5)
         ttk.Button(f_in, text="Compute", command=self.thread_compute).grid(row=6, column=1, sticky="w")
 
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(f_in, textvariable=self.status_var, foreground="#006064").grid(row=7, column=0, columnspan=2, sticky="w")
+
         # --- Output Frame ---
         f_out = ttk.LabelFrame(main, text="Output", padding=10)
         f_out.pack(side="right", fill="both", expand=True, padx=10, pady=10)
@@ -337,13 +727,13 @@ class App(tk.Tk):
         # Nearest Neighbour Tab
         self.nn_tab = ttk.Frame(self.tabs)
         self.tabs.add(self.nn_tab, text="Nearest Neighbour")
-        self.nn_canvas = tk.Canvas(self.nn_tab, width=800, height=400, bg="#e8f5e9", highlightthickness=0)
+        self.nn_canvas = tk.Canvas(self.nn_tab, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="#e8f5e9", highlightthickness=0)
         self.nn_canvas.pack()
 
         # Brute Force Tab
         self.bf_tab = ttk.Frame(self.tabs)
         self.tabs.add(self.bf_tab, text="Brute Force (Optimal)")
-        self.bf_canvas = tk.Canvas(self.bf_tab, width=800, height=400, bg="#f3e5f5", highlightthickness=0)
+        self.bf_canvas = tk.Canvas(self.bf_tab, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="#f3e5f5", highlightthickness=0)
         self.bf_canvas.pack()
 
 
@@ -384,10 +774,7 @@ class App(tk.Tk):
   
 
     def thread_compute(self):
-        threading.Thread(target=self.compute, daemon=True).start()
-
-
-    def compute(self):
+        """Read the form on the Tk thread, then geocode and solve on a worker thread."""
         api = self.api_entry.get().strip() or None
         start_q = self.start_entry.get().strip()
         dests = list(self.destinations_raw)
@@ -399,83 +786,152 @@ class App(tk.Tk):
         if not dests:
             messagebox.showerror("Missing", "Need at least one destination")
             return
+        if len(dests) > HELD_KARP_MAX_POINTS:
+            messagebox.showerror("Too many stops", f"The optimal route can be computed for at most {HELD_KARP_MAX_POINTS} destinations")
+            return
 
+        # pressing Compute again abandons the previous run
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        self.cancel_event = threading.Event()
+        threading.Thread(target=self.compute, args=(api, start_q, dests, raw_labels, self.cancel_event),
+                         daemon=True).start()
+
+    def set_status(self, text):
+        self.status_var.set(text)
+
+    def geocode_all(self, geocoder, queries, cancel):
+        """Geocode the queries (concurrently where the provider allows); returns the results in order, or None on failure/cancel."""
+        results = [None] * len(queries)
+        with ThreadPoolExecutor(max_workers=geocoder.max_workers) as ex:
+            futures = {ex.submit(geocoder.geocode, q): i for i, q in enumerate(queries)}
+            for done, fut in enumerate(as_completed(futures), start=1):
+                i = futures[fut]
+                g = fut.result()
+                if cancel.is_set():
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    return None
+                if not g or g[0] is None:
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    msg = "Failed geocoding start" if i == 0 else f"Failed geocoding {queries[i]}"
+                    self.after(0, self.set_status, "")
+                    self.after(0, messagebox.showerror, "Error", msg)
+                    return None
+                results[i] = g
+                self.after(0, self.set_status, f"Geocoded {done}/{len(queries)}")
+        return results
+
+    def compute(self, api, start_q, dests, raw_labels, cancel):
         geocoder = Geocoder(api)
-        start_geo = geocoder.geocode(start_q)
-        if not start_geo or start_geo[0] is None:
-            messagebox.showerror("Error", "Failed geocoding start")
+        geos = self.geocode_all(geocoder, [start_q] + dests, cancel)
+        geocoder.save_cache()
+        if geos is None or cancel.is_set():
             return
-        self.start_loc = (start_geo[0], start_geo[1])
-
-        self.points = []
-        for d in dests:
-            g = geocoder.geocode(d)
-            if not g or g[0] is None:
-                messagebox.showerror("Error", f"Failed geocoding {d}")
-                return
-            self.points.append((g[0], g[1], g[2]))
-
-        # After building self.points, build display labels per destination
-        if raw_labels and len(raw_labels) == len(self.points):
-            self.point_labels = raw_labels
+        # everything is built in locals: only show_results, on the Tk thread, stores it on the app
+        start_geo, geos = geos[0], geos[1:]
+        start_loc = (start_geo[0], start_geo[1])
+        lats = [g[0] for g in geos]
+        lons = [g[1] for g in geos]
+        names = [g[2] for g in geos]
+
+        # After building the destinations, build display labels per destination
+        if raw_labels and len(raw_labels) == len(names):
+            labels = raw_labels
         else:
             # Fallback: generate Location 1, 2, ...
-            self.point_labels = [f"Location {i+1}" for i in range(len(self.points))]
+            labels = [f"Location {i+1}" for i in range(len(names))]
+
+        # Distances between every pair of nodes (start is node 0), shared by both algorithms and the graphs
+        node_lats = [start_loc[0], *lats]
+        node_lons = [start_loc[1], *lons]
+        D = distance_matrix([math.radians(lat) for lat in node_lats],
+                            [math.radians(lon) for lon in node_lons])
+
+        self.after(0, self.set_status, "Computing routes...")
 
         # Compute Nearest Neighbour
         nn = NearestNeighbourAlgorithm()
-        self.order_nn, dist_nn = nn.compute(self.start_loc, self.points)
+        order_nn, dist_nn = nn.compute(D)
+
+        # Compute the optimal tour: enumerate permutations for small inputs, Held-Karp beyond
+        if len(names) <= BRUTE_FORCE_MAX_POINTS:
+            exact = BruteForceAlgorithm()
+        else:
+            exact = HeldKarpAlgorithm()
+        order_bf, dist_bf = exact.compute(D)
 
-        # Compute Brute Force
-        bf = BruteForceAlgorithm()
-        self.order_bf, dist_bf = bf.compute(self.start_loc, self.points)
+        if cancel.is_set():
+            return
+        # widgets and app state may only be touched from the Tk thread
+        self.after(0, self.show_results, cancel, start_loc, lats, lons, names, labels,
+                   D, order_nn, dist_nn, order_bf, dist_bf)
+
+    def show_results(self, cancel, start_loc, lats, lons, names, labels,
+                     D, order_nn, dist_nn, order_bf, dist_bf):
+        """Store a finished run and draw its report and route graphs; runs on the Tk thread."""
+        # a newer Compute may have started after this run queued its results
+        if cancel is not self.cancel_event or cancel.is_set():
+            return
+        self.start_loc = start_loc
+        self.set_destinations(lats, lons, names)
+        self.point_labels = labels
+        self.order_nn = order_nn
+        self.order_bf = order_bf
+        self.set_status("Done")
+
+        # Print results: build the whole report, then hand it to Tk in one insert
+        lines = ["Nearest Neighbour:\n"]
+        lines.extend(f" → {self.point_labels[idx]} ({self.names[idx]})\n" for idx in self.order_nn)
+        lines.append(f"Total: {dist_nn:.2f} km\n\n")
+
+        lines.append("Brute Force:\n")
+        lines.extend(f" → {self.point_labels[idx]} ({self.names[idx]})\n" for idx in self.order_bf)
+        lines.append(f"Total: {dist_bf:.2f} km\n")
 
-        # Print results
         self.out_box.delete("1.0", "end")
-        self.out_box.insert("end", "Nearest Neighbour:\n")
-        for idx in self.order_nn:
-            self.out_box.insert("end", f" → {self.point_labels[idx]} ({self.points[idx][2]})\n")
-        self.out_box.insert("end", f"Total: {dist_nn:.2f} km\n\n")
-
-        self.out_box.insert("end", "Brute Force:\n")
-        for idx in self.order_bf:
-            self.out_box.insert("end", f" → {self.point_labels[idx]} ({self.points[idx][2]})\n")
-        self.out_box.insert("end", f"Total: {dist_bf:.2f} km\n")
+        self.out_box.insert("end", "".join(lines))
 
         # Draw graphs
         gd = GraphDrawer()
+        node_lats = [start_loc[0], *lats]
+        node_lons = [start_loc[1], *lons]
         labels = ["Start"] + self.point_labels
-        coords = [self.start_loc] + [(p[0], p[1]) for p in self.points]
         # Build a helper to create edges between every consecutive node (including return)
         def build_edges(order):
             edges = []
             prev_idx = 0  # start index in labels
-            prev_point = self.start_loc
-            for pos, pt_idx in enumerate(order, start=1):
-                pt = (self.points[pt_idx][0], self.points[pt_idx][1])
-                d = haversine(prev_point, pt)
-                edges.append((prev_idx, pos, d))
-                prev_idx, prev_point = pos, pt
+            for pt_idx in order:
+                node = pt_idx + 1
+                edges.append((prev_idx, node, float(D[prev_idx][node])))
+                prev_idx = node
             # return to start
-            d_back = haversine(prev_point, self.start_loc)
-            edges.append((prev_idx, 0, d_back))
+            edges.append((prev_idx, 0, float(D[prev_idx][0])))
             return edges
 
         nn_edges = build_edges(self.order_nn)
         bf_edges = build_edges(self.order_bf)
 
         # NN graph: heuristic path with arrows and distances
-        gd.draw(self.nn_canvas, labels, coords, nn_edges, highlight=True)
+        gd.draw(self.nn_canvas, labels, node_lats, node_lons, nn_edges, highlight=True)
         # BF graph: optimal (shortest) path with arrows and distances
-        gd.draw(self.bf_canvas, labels, coords, bf_edges, highlight=True)
+        gd.draw(self.bf_canvas, labels, node_lats, node_lons, bf_edges, highlight=True)
 
   
 
+    def set_destinations(self, lats, lons, names):
+        """Store destinations as parallel latitude/longitude arrays (NumPy when available) plus names."""
+        if NUMPY_AVAILABLE:
+            lats = np.array(lats, dtype=float)
+            lons = np.array(lons, dtype=float)
+        self.lats = lats
+        self.lons = lons
+        self.names = list(names)
+
     def open_maps(self):
-        if not self.points or not self.order_nn:
+        if not self.names or not self.order_nn:
             return
         origin = f"{self.start_loc[0]},{self.start_loc[1]}"
-        waypoints = [f"{self.points[i][0]},{self.points[i][1]}" for i in self.order_nn]
+        waypoints = [f"{self.lats[i]},{self.lons[i]}" for i in self.order_nn]
 
         url = (
             "https://www.google.com/maps/dir/?api=1"
@@ -486,12 +942,13 @@ class App(tk.Tk):
         webbrowser.open(url)
 
     def save_locations(self):
-        if not self.start_loc or not self.points:
+        if not self.start_loc or not self.names:
             messagebox.showerror("Error", "No locations to save")
             return
         data = {
             "start": {"lat": self.start_loc[0], "lon": self.start_loc[1]},
-            "points": [{"lat": p[0], "lon": p[1], "name": p[2]} for p in self.points]
+            "points": [{"lat": float(lat), "lon": float(lon), "name": name}
+                       for lat, lon, name in zip(self.lats, self.lons, self.names)]
         }
         fname = "locations.json"
         with open(fname, "w") as f:
@@ -506,17 +963,19 @@ class App(tk.Tk):
         with open(fname) as f:
             data = json.load(f)
         self.start_loc = (data["start"]["lat"], data["start"]["lon"])
-        self.points = [(p["lat"], p["lon"], p["name"]) for p in data["points"]]
+        pts = data["points"]
+        self.set_destinations([p["lat"] for p in pts], [p["lon"] for p in pts], [p["name"] for p in pts])
         self.start_entry.delete(0, "end")
-        self.start_entry.insert("0", self.points[0][2])
-        self.dest_text.delete("1.0", "end")
-        for p in self.points:
-            self.dest_text.insert("end", f"{p[2]}\n")
+        self.start_entry.insert("0", self.names[0])
+        self.destinations_raw = list(self.names)
+        self.labels_raw = [f"Location {i+1}" for i in range(len(self.names))]
+        self.locations_list.delete(0, "end")
+        for lbl, name in zip(self.labels_raw, self.names):
+            self.locations_list.insert("end", f"{lbl} ({name})")
         messagebox.showinfo("Loaded", f"Locations loaded from {fname}")
 
     def show_map_preview(self):
-        mp = MapPreview(PIL_AVAILABLE)
-        img = mp.generate(self.start_loc, self.points)
+        img = self.map_preview.generate(self.start_loc, self.lats, self.lons)
         if img:
             img.thumbnail((600, 300))
             self.map_img = ImageTk.PhotoImage(img)
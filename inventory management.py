@@ -3,9 +3,62 @@ from tkinter import ttk, messagebox
 import json
 from datetime import datetime
 import random
+from bisect import bisect_left
+from itertools import islice
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
 
 INVENTORY_FILE = "coursework/inventory managment/inventory.json"
 ORDER_FILE = "coursework/inventory managment/orders.json"
+# stock edits arriving within this window are written to disk together
+SAVE_DELAY_MS = 2000
+SEARCH_FIELDS = ("id", "name", "group", "supplier_id")
+# only the last keystroke within this window triggers a table reload
+SEARCH_DELAY_MS = 150
+# above this many rows the table only holds the rows in view and the scrollbar pages through the rest
+VIRTUAL_MIN_ROWS = 1000
+ROW_HEIGHT = 20
+# the low-stock alert names at most this many items and counts the rest
+ALERT_MAX_ITEMS = 50
+# inserts a list of {iid values tags} rows in one Tcl call
+BULK_INSERT_PROC = """
+proc inventory_bulk_insert {tree rows} {
+    foreach row $rows {
+        lassign $row iid values tags
+        $tree insert {} end -id $iid -values $values -tags $tags
+    }
+}
+"""
+# a big fill shows this many rows straight away and adds the rest in chunks of this size between events
+LOAD_CHUNK_ROWS = 200
+
+
+def canonical_id(item_id):
+    """Key used for an item everywhere in InventoryManager.items."""
+    return str(item_id).strip()
+
+
+def read_json(path):
+    """Parse a JSON file, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_json(path, payload):
+    """Write payload as compact JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(payload))
+        return
+    with open(path, "w") as f:
+        json.dump(payload, f)
 
 # Inventory Item
 
@@ -13,13 +66,33 @@ class InventoryItem:
     def __init__(self, item_id, name, quantity, threshold, reorder_amount, group, supplier_id):
         self.id = item_id
         self.name = name
-        self.quantity = quantity
-        self.threshold = threshold
+        self._threshold = threshold
+        self.quantity = quantity  # also sets low_stock
         self.reorder_amount = reorder_amount
         self.group = group
         self.supplier_id = supplier_id
         self.last_reordered = None
 
+    # low_stock (at or below threshold) is kept in step with quantity/threshold
+    # so refreshes read a flag instead of re-comparing every item
+    @property
+    def quantity(self):
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value):
+        self._quantity = value
+        self.low_stock = value <= self._threshold
+
+    @property
+    def threshold(self):
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value):
+        self._threshold = value
+        self.low_stock = self._quantity <= value
+
     def needs_reorder(self):
         return self.quantity < self.threshold
 
@@ -38,77 +111,98 @@ class InventoryItem:
 
 # Inventory Manager
 class InventoryManager:
-    def __init__(self):
+    def __init__(self, scheduler=None):
         self.items = {}
+        # scheduler(delay_ms, callback), e.g. Tk's root.after; without one every edit saves immediately
+        self.scheduler = scheduler
+        self.save_pending = False
+        # field -> [(item, lowercased value)], rebuilt lazily after any edit to a searchable field
+        self.search_index = None
+        # every item ordered by (group, id), with the sort keys alongside for bisecting; kept current by add/update/delete
+        self.group_keys = []
+        self.by_group = []
         self.load_data()
 
     # JSON LOAD 
     def load_data(self):
         try:
-            with open(INVENTORY_FILE, "r") as f:
-                data = json.load(f)
-            for item_id, d in data.items():
+            data = read_json(INVENTORY_FILE)
+            for d in data.values():
                 item = InventoryItem(
-                    d["id"], d["name"], d["quantity"], d["threshold"],
+                    canonical_id(d["id"]), d["name"], d["quantity"], d["threshold"],
                     d["reorder_amount"], d["group"], d["supplier_id"]
                 )
                 item.last_reordered = d["last_reordered"]
-                self.items[item_id] = item
+                self.items[item.id] = item
         except FileNotFoundError:
             pass
+        self.search_index = None
+        self.by_group = sorted(self.items.values(), key=lambda x: (x.group, x.id))
+        self.group_keys = [(item.group, item.id) for item in self.by_group]
 
     #  SAVE
     def save_data(self):
+        self.save_pending = False
         data = {i: item.to_dict() for i, item in self.items.items()}
-        with open(INVENTORY_FILE, "w") as f:
-            json.dump(data, f, indent=4)
+        write_json(INVENTORY_FILE, data)
+
+    def save_later(self):
+        """Coalesce bursts of edits into one save SAVE_DELAY_MS after the first of them."""
+        if self.scheduler is None:
+            self.save_data()
+            return
+        if not self.save_pending:
+            self.save_pending = True
+            self.scheduler(SAVE_DELAY_MS, self.flush)
+
+    def flush(self):
+        """Write any edits still waiting on save_later()."""
+        if self.save_pending:
+            self.save_data()
 
     #  CRUD 
     def add_item(self, item):
+        item.id = canonical_id(item.id)
         if item.id in self.items:
             return False
         self.items[item.id] = item
+        self.add_to_group_order(item)
+        self.search_index = None
         self.save_data()
         return True
 
     def update_item(self, item_id, name, quantity, threshold, reorder_amount, group):
-        if item_id not in self.items:
+        item = self.items.get(canonical_id(item_id))
+        if item is None:
             return False
 
-        item = self.items[item_id]
         item.name = name
         item.quantity = quantity
         item.threshold = threshold
         item.reorder_amount = reorder_amount
-        item.group = group
+        if group != item.group:
+            self.remove_from_group_order(item)
+            item.group = group
+            self.add_to_group_order(item)
 
-        self.save_data()
+        self.search_index = None
+        self.save_later()
         return True
 
     def delete_item(self, item_id):
-        # delete by matching the InventoryItem.id field, not assuming dict key
-        key_to_delete = None
-        for key, item in self.items.items():
-            if str(item.id).strip() == str(item_id).strip():
-                key_to_delete = key
-                break
-
-        if key_to_delete is not None:
-            del self.items[key_to_delete]
-            self.save_data()
-            return True
+        # items are keyed by their canonical id, so no scan is needed
+        key = canonical_id(item_id)
+        if key not in self.items:
+            return False
 
-        return False
+        self.remove_from_group_order(self.items.pop(key))
+        self.search_index = None
+        self.save_data()
+        return True
 
     #  STOCK UPDATE 
     def set_quantity(self, item_id, new_quantity):
-        # find the actual item object by matching its .id field
-        target = None
-        for item in self.items.values():
-            if str(item.id).strip() == str(item_id).strip():
-                target = item
-                break
-
+        target = self.items.get(canonical_id(item_id))
         if target is None:
             return False
 
@@ -120,14 +214,24 @@ class InventoryManager:
             return False
 
         target.quantity = q
-        self.save_data()
+        self.save_later()
         return True
 
     #  SEARCH
+    def build_search_index(self):
+        self.search_index = {
+            field: [(item, str(getattr(item, field)).lower()) for item in self.items.values()]
+            for field in SEARCH_FIELDS
+        }
+
     def search(self, field, text):
         text = text.lower()
-        results = []
+        if field in SEARCH_FIELDS:
+            if self.search_index is None:
+                self.build_search_index()
+            return [item for item, value in self.search_index[field] if text in value]
 
+        results = []
         for item in self.items.values():
             value = str(getattr(item, field)).lower()
             if text in value:
@@ -136,8 +240,20 @@ class InventoryManager:
         return results
 
     #  SORT 
+    def add_to_group_order(self, item):
+        key = (item.group, item.id)
+        i = bisect_left(self.group_keys, key)
+        self.group_keys.insert(i, key)
+        self.by_group.insert(i, item)
+
+    def remove_from_group_order(self, item):
+        i = bisect_left(self.group_keys, (item.group, item.id))
+        del self.group_keys[i]
+        del self.by_group[i]
+
     def sort_by_group(self):
-        return sorted(self.items.values(), key=lambda x: x.group)
+        """Items ordered by group, then id. The list is the manager's own, so don't modify it."""
+        return self.by_group
 
 
 
@@ -150,14 +266,12 @@ class OrderManager:
 
     def load_orders(self):
         try:
-            with open(ORDER_FILE, "r") as f:
-                self.orders = json.load(f)
+            self.orders = read_json(ORDER_FILE)
         except FileNotFoundError:
             pass
 
     def save_orders(self):
-        with open(ORDER_FILE, "w") as f:
-            json.dump(self.orders, f, indent=4)
+        write_json(ORDER_FILE, self.orders)
 
     def create_order(self, item_id, item_name, quantity, supplier_id):
         order = {
@@ -183,6 +297,8 @@ class AddItemWindow:
         self.win = tk.Toplevel(parent)
         self.win.title("Add New Item")
         self.win.geometry("400x450")
+        # the window is hidden rather than destroyed so the main GUI can reopen it
+        self.win.protocol("WM_DELETE_WINDOW", self.win.withdraw)
 
         groups = ["Electronics", "Grocery", "Clothing", "Stationery", "Others"]
 
@@ -205,6 +321,13 @@ class AddItemWindow:
 
         ttk.Button(self.win, text="Add Item", command=self.save_item).pack(pady=10)
 
+    def reset(self):
+        """Clear the form for the next item."""
+        for entry in self.entries.values():
+            entry.delete(0, tk.END)
+        self.group_var.set("")
+        self.supplier_id = f"SUP{random.randint(1000,9999)}"
+
     def save_item(self):
         try:
             item = InventoryItem(
@@ -226,7 +349,7 @@ class AddItemWindow:
 
         messagebox.showinfo("Success", "Item added successfully.")
         self.refresh_callback()
-        self.win.destroy()
+        self.win.withdraw()
 
 
 # Order Window
@@ -240,11 +363,11 @@ class OrderWindow:
         self.win = tk.Toplevel(parent)
         self.win.title("Order Item")
         self.win.geometry("400x300")
+        self.win.protocol("WM_DELETE_WINDOW", self.win.withdraw)
 
         ttk.Label(self.win, text="Select Item").pack()
         self.item_var = tk.StringVar()
-        item_list = [f"{i.id} - {i.name}" for i in manager.items.values()]
-        self.item_combo = ttk.Combobox(self.win, values=item_list, textvariable=self.item_var, state="readonly")
+        self.item_combo = ttk.Combobox(self.win, textvariable=self.item_var, state="readonly")
         self.item_combo.pack()
 
         ttk.Label(self.win, text="Quantity").pack()
@@ -252,13 +375,20 @@ class OrderWindow:
         self.qty_entry.pack()
 
         ttk.Button(self.win, text="Place Order", command=self.place_order).pack(pady=10)
+        self.reset()
+
+    def reset(self):
+        """Refresh the item choices, which may have changed since the window was last open."""
+        self.item_combo["values"] = [f"{i.id} - {i.name}" for i in self.manager.items.values()]
+        self.item_var.set("")
+        self.qty_entry.delete(0, tk.END)
 
     def place_order(self):
         if not self.item_var.get():
             messagebox.showerror("Error", "Select an item")
             return
 
-        item_id = self.item_var.get().split(" - ")[0]
+        item_id = canonical_id(self.item_var.get().split(" - ")[0])
         item = self.manager.items[item_id]
 
         try:
@@ -282,11 +412,15 @@ class OrderWindow:
         # refresh main table and threshold highlighting
         if self.refresh_callback:
             self.refresh_callback()
-        self.win.destroy()
+        self.win.withdraw()
 
 # Update Stock Window
 
 class UpdateStockWindow:
+    # positional ids of the QUANTITY and NEW_QTY columns, as Treeview reports and accepts them
+    COL_QTY = "#3"
+    COL_NEWQ = "#4"
+
     def __init__(self, parent, manager, refresh_callback):
         self.manager = manager
         self.refresh_callback = refresh_callback
@@ -294,6 +428,7 @@ class UpdateStockWindow:
         self.win = tk.Toplevel(parent)
         self.win.title("Update Stock")
         self.win.geometry("500x400")
+        self.win.protocol("WM_DELETE_WINDOW", self.win.withdraw)
 
         header = ttk.Label(self.win, text="Update Stock Levels", font=("Segoe UI", 12, "bold"))
         header.pack(pady=5)
@@ -309,9 +444,9 @@ class UpdateStockWindow:
             self.table.column(c, width=120)
         self.table.pack(fill="both", expand=True)
 
-        for item in self.manager.items.values():
-            # last column (NEW_QTY) starts empty until user enters a value
-            self.table.insert("", tk.END, values=(item.id, item.name, item.quantity, ""))
+        self.item_id_by_iid = {}
+        self.edit_entry = None
+        self.reset()
 
         bottom = ttk.Frame(self.win)
         bottom.pack(fill="x", padx=10, pady=10)
@@ -320,7 +455,18 @@ class UpdateStockWindow:
 
         # support in-place editing of NEW_QTY cells
         self.table.bind("<Double-1>", self.start_edit_cell)
-        self.edit_entry = None
+
+    def reset(self):
+        """Reload the rows so they show current quantities."""
+        if self.edit_entry is not None:
+            self.edit_entry.destroy()
+            self.edit_entry = None
+        self.table.delete(*self.item_id_by_iid)
+        self.item_id_by_iid = {}
+        for item in self.manager.items.values():
+            # last column (NEW_QTY) starts empty until user enters a value
+            iid = self.table.insert("", tk.END, values=(item.id, item.name, item.quantity, ""))
+            self.item_id_by_iid[iid] = item.id
 
     def start_edit_cell(self, event):
         # detect which row/column was clicked
@@ -332,12 +478,12 @@ class UpdateStockWindow:
         col_id = self.table.identify_column(event.x)
 
         # only allow editing of NEW_QTY column (#4)
-        if col_id != "#4" or not row_id:
+        if col_id != self.COL_NEWQ or not row_id:
             return
 
         # get cell bounding box
         x, y, w, h = self.table.bbox(row_id, col_id)
-        value = self.table.set(row_id, "new_qty")
+        value = self.table.set(row_id, self.COL_NEWQ)
 
         # destroy previous editor if any
         if self.edit_entry is not None:
@@ -360,11 +506,7 @@ class UpdateStockWindow:
         self.edit_entry = None
 
         # write new value into NEW_QTY column for that row
-        vals = list(self.table.item(row_id)["values"])
-        if len(vals) < 4:
-            return
-        vals[3] = new_val
-        self.table.item(row_id, values=vals)
+        self.table.set(row_id, self.COL_NEWQ, new_val)
 
     def apply_update(self):
         selected = self.table.focus()
@@ -372,10 +514,14 @@ class UpdateStockWindow:
             messagebox.showerror("Error", "Select a product to update")
             return
 
-        vals = list(self.table.item(selected)["values"])
-        item_id = vals[0]
+        item_id = self.item_id_by_iid[selected]
+        # the item may have been deleted from the main window while this one stayed open
+        item = self.manager.items.get(item_id)
+        if item is None:
+            messagebox.showerror("Error", "Item not found")
+            return
         # prefer NEW_QTY cell; if empty, fall back to current quantity
-        new_q = str(vals[3]).strip() or str(vals[2]).strip()
+        new_q = str(self.table.set(selected, self.COL_NEWQ)).strip() or str(item.quantity)
 
         if not self.manager.set_quantity(item_id, new_q):
             messagebox.showerror("Error", "Please enter a valid non-negative number")
@@ -383,10 +529,9 @@ class UpdateStockWindow:
 
         messagebox.showinfo("Updated", "Stock level updated")
 
-        # write the new quantity back into the QUANTITY and NEW_QTY columns
-        vals[2] = int(new_q)
-        vals[3] = new_q
-        self.table.item(selected, values=vals)
+        # write the new quantity back into the QUANTITY and NEW_QTY cells
+        self.table.set(selected, self.COL_QTY, int(new_q))
+        self.table.set(selected, self.COL_NEWQ, new_q)
 
         # refresh main table and check thresholds in the main GUI
         self.refresh_callback()
@@ -402,13 +547,60 @@ class InventoryGUI:
         self.root.geometry("1300x600")
         self.root.configure(bg="#00151c")  # darker blue background
 
-        self.manager = InventoryManager()
+        self.manager = InventoryManager(scheduler=self.root.after)
         self.order_manager = OrderManager()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # rows currently in the table: item id <-> Treeview iid, plus per-iid values and tag last written,
+        # and the iids in display order
+        self.row_iid_by_id = {}
+        self.item_id_by_iid = {}
+        self.row_vals = {}
+        self.row_tags = {}
+        self.dirty_ids = set()  # item ids whose rows were rewritten since the last highlight
+        self.row_order = []
+        self.row_seq = 0  # source of iids for rows added by render_rows
+        # rows render_rows has recorded but not yet inserted, and the idle callback inserting them
+        self.pending_rows = []
+        self.fill_after_id = None
+        # everything the current view lists, in order; in virtual mode only view_items[view_top:][:visible rows] is in the table
+        self.view_items = []
+        self.view_top = 0
+        self.search_after_id = None  # pending debounced search, if any
+        # dialogs are built on first use, then hidden and reshown
+        self.add_win = None
+        self.order_win = None
+        self.update_win = None
 
         self.build_ui()
         self.load_table()
         self.check_all_thresholds()
 
+    # ttk styles live in the Tcl interpreter, so they only need setting up once per root
+    styled_interp = None
+
+    def configure_styles(self):
+        if InventoryGUI.styled_interp is self.root.tk:
+            return
+
+        btn_style = ttk.Style()
+        btn_style.theme_use("clam")
+
+        btn_style.configure("Green.TButton", font=("Segoe UI", 13, "bold"), padding=20,
+                    foreground="white", background="#006400")
+        btn_style.map("Green.TButton", background=[("active", "#008000")])
+
+        btn_style.configure("Blue.TButton", font=("Segoe UI", 13, "bold"), padding=20,
+                    foreground="white", background="#003366")
+        btn_style.map("Blue.TButton", background=[("active", "#004c99")])
+
+        btn_style.configure("Red.TButton", font=("Segoe UI", 13, "bold"), padding=20,
+                    foreground="white", background="#660000")
+        btn_style.map("Red.TButton", background=[("active", "#990000")])
+
+        btn_style.configure("Treeview", rowheight=ROW_HEIGHT)
+        InventoryGUI.styled_interp = self.root.tk
+
     def build_ui(self):
         main = tk.Frame(self.root, bg="#00151c")
         main.pack(fill="both", expand=True, padx=10, pady=10)
@@ -425,7 +617,7 @@ class InventoryGUI:
         tk.Label(search_frame, text="Search by: ", fg="white", bg="#00151c", font=("Segoe UI", 11, "bold")).pack(side="left")
 
         self.search_field = tk.StringVar()
-        search_fields = ["id", "name", "group", "supplier_id"]
+        search_fields = list(SEARCH_FIELDS)
         self.search_combo = ttk.Combobox(search_frame, textvariable=self.search_field, values=search_fields, width=15)
         self.search_combo.current(0)
         self.search_combo.pack(side="left")
@@ -437,20 +629,7 @@ class InventoryGUI:
         ttk.Button(search_frame, text="Sort by Group", command=self.sort_group).pack(side="left", padx=5)
 
         # Buttons 
-        btn_style = ttk.Style()
-        btn_style.theme_use("clam")
-
-        btn_style.configure("Green.TButton", font=("Segoe UI", 13, "bold"), padding=20,
-                    foreground="white", background="#006400")
-        btn_style.map("Green.TButton", background=[("active", "#008000")])
-
-        btn_style.configure("Blue.TButton", font=("Segoe UI", 13, "bold"), padding=20,
-                    foreground="white", background="#003366")
-        btn_style.map("Blue.TButton", background=[("active", "#004c99")])
-
-        btn_style.configure("Red.TButton", font=("Segoe UI", 13, "bold"), padding=20,
-                    foreground="white", background="#660000")
-        btn_style.map("Red.TButton", background=[("active", "#990000")])
+        self.configure_styles()
 
         ttk.Button(button_frame, text="Add Item", command=self.open_add_window, style="Green.TButton").pack(fill="x", pady=10)
         ttk.Button(button_frame, text="Order Item", command=self.open_order_window, style="Blue.TButton").pack(fill="x", pady=10)
@@ -459,60 +638,198 @@ class InventoryGUI:
 
         # Table 
         columns = ("id", "name", "quantity", "threshold", "reorder", "group", "supplier", "last_reordered")
-        self.table = ttk.Treeview(main, columns=columns, show="headings", height=20)
+        self.table = ttk.Treeview(main, columns=columns, show="headings", height=20,
+                                  yscrollcommand=self.on_table_scroll)
 
         for col in columns:
             self.table.heading(col, text=col.upper())
             self.table.column(col, width=140)
+        self.table.tk.eval(BULK_INSERT_PROC)
 
+        self.scrollbar = ttk.Scrollbar(main, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
         self.table.pack(fill="both", expand=True)
+        self.table.tag_configure("low_stock", background="#5c1b1b", foreground="white")
 
+        self.table.bind("<MouseWheel>", self.on_mousewheel)
+        self.table.bind("<Button-4>", self.on_mousewheel)
+        self.table.bind("<Button-5>", self.on_mousewheel)
+        self.table.bind("<Configure>", lambda e: self.is_virtual() and self.render_rows())
 
-    def load_table(self, items=None):
-        for row in self.table.get_children():
-            self.table.delete(row)
 
+    def load_table(self, items=None):
         if items is None:
             items = self.manager.items.values()
-
-        for item in items:
-            self.table.insert("", tk.END, values=(
+        self.view_items = list(items)
+        self.render_rows()
+
+    # Virtual scrolling: with more than VIRTUAL_MIN_ROWS rows the Treeview only holds one
+    # screenful, and the scrollbar/mouse wheel move view_top through view_items instead.
+    def is_virtual(self):
+        return len(self.view_items) > VIRTUAL_MIN_ROWS
+
+    def visible_rows(self):
+        rows = self.table.winfo_height() // ROW_HEIGHT - 1  # minus the heading
+        return rows if rows > 0 else int(self.table.cget("height"))
+
+    def visible_slice(self):
+        if not self.is_virtual():
+            return slice(None)
+        rows = self.visible_rows()
+        self.view_top = max(0, min(self.view_top, len(self.view_items) - rows))
+        return slice(self.view_top, self.view_top + rows)
+
+    def scroll_to(self, top):
+        self.view_top = top
+        self.render_rows()
+
+    def on_scrollbar(self, *args):
+        if not self.is_virtual():
+            self.table.yview(*args)
+            return
+        rows = self.visible_rows()
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.view_items)))
+        elif args[0] == "scroll":
+            step = rows if args[2] == "pages" else 1
+            self.scroll_to(self.view_top + int(args[1]) * step)
+
+    def on_table_scroll(self, first, last):
+        # in virtual mode the table never scrolls itself; render_rows drives the scrollbar
+        if not self.is_virtual():
+            self.scrollbar.set(first, last)
+
+    def on_mousewheel(self, event):
+        if not self.is_virtual():
+            return None
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.view_top - 3)
+        else:
+            self.scroll_to(self.view_top + 3)
+        return "break"
+
+    def insert_rows(self, rows):
+        # new rows go in with a single Tcl call instead of one insert round-trip each;
+        # Tk only repaints at idle, so nothing is drawn until the whole batch is in
+        self.table.tk.call("inventory_bulk_insert", self.table, tuple(rows))
+
+    def insert_pending_rows(self):
+        self.fill_after_id = None
+        chunk = self.pending_rows[:LOAD_CHUNK_ROWS]
+        del self.pending_rows[:LOAD_CHUNK_ROWS]
+        self.insert_rows(chunk)
+        if self.pending_rows:
+            self.fill_after_id = self.root.after_idle(self.insert_pending_rows)
+
+    def flush_pending_rows(self):
+        # anything about to touch rows by iid needs them all to exist
+        if self.fill_after_id is not None:
+            self.root.after_cancel(self.fill_after_id)
+            self.fill_after_id = None
+        if self.pending_rows:
+            self.insert_rows(self.pending_rows)
+            self.pending_rows = []
+
+    def render_rows(self):
+        self.flush_pending_rows()
+
+        # diff against the rows already shown: delete, insert or rewrite only what changed
+        window = self.view_items[self.visible_slice()]
+
+        wanted = {}
+        for item in window:
+            wanted[item.id] = item
+
+        stale = [iid for item_id, iid in self.row_iid_by_id.items() if item_id not in wanted]
+        if stale:
+            self.table.delete(*stale)
+            stale_set = set(stale)
+            self.row_iid_by_id = {k: v for k, v in self.row_iid_by_id.items() if v not in stale_set}
+            for iid in stale:
+                del self.item_id_by_iid[iid]
+                del self.row_vals[iid]
+                self.row_tags.pop(iid, None)
+            self.row_order = [iid for iid in self.row_order if iid not in stale_set]
+
+        order = []
+        new_rows = []
+        for item_id, item in wanted.items():
+            vals = (
                 item.id, item.name, item.quantity, item.threshold,
                 item.reorder_amount, item.group, item.supplier_id,
                 item.last_reordered
-            ))
+            )
+            iid = self.row_iid_by_id.get(item_id)
+            if iid is None:
+                self.row_seq += 1
+                iid = f"row{self.row_seq}"
+                # new rows are inserted already tagged, so they never need highlighting afterwards
+                tag = "low_stock" if item.low_stock else ""
+                new_rows.append((iid, vals, tag))
+                self.row_iid_by_id[item_id] = iid
+                self.item_id_by_iid[iid] = item_id
+                self.row_tags[iid] = tag
+                self.row_order.append(iid)
+            elif self.row_vals[iid] != vals:
+                self.table.item(iid, values=vals)
+                self.dirty_ids.add(item_id)
+            self.row_vals[iid] = vals
+            order.append(iid)
+
+        if order != self.row_order:
+            # one call reorders every row, and only when the order differs; it needs every row to exist
+            self.insert_rows(new_rows)
+            self.table.set_children("", *order)
+            self.row_order = order
+        elif new_rows:
+            # new rows all go at the end: show a few chunks now and let the rest follow between events
+            head = 3 * LOAD_CHUNK_ROWS
+            self.insert_rows(new_rows[:head])
+            self.pending_rows = new_rows[head:]
+            if self.pending_rows:
+                self.fill_after_id = self.root.after_idle(self.insert_pending_rows)
+
+        if self.is_virtual():
+            n = len(self.view_items)
+            self.scrollbar.set(self.view_top / n, (self.view_top + len(window)) / n)
 
         # after loading, highlight low-stock rows
         self.highlight_low_stock_rows()
 
     def highlight_low_stock_rows(self):
-        # configure tag
-        self.table.tag_configure("low_stock", background="#5c1b1b", foreground="white")
-
-        for row in self.table.get_children():
-            vals = self.table.item(row)["values"]
-            if len(vals) < 4:
+        # quantity and threshold are both row values, so only rows render_rows rewrote can
+        # have changed state; of those, only touch rows whose tag actually changes
+        items = self.manager.items
+        for item_id in self.dirty_ids:
+            iid = self.row_iid_by_id.get(item_id)
+            item = items.get(item_id)
+            if iid is None or item is None:
                 continue
-            qty = vals[2]
-            thr = vals[3]
-            try:
-                qty = int(qty)
-                thr = int(thr)
-            except ValueError:
-                continue
-            if qty <= thr:
-                self.table.item(row, tags=("low_stock",))
-            else:
-                self.table.item(row, tags=("",))
+            tag = "low_stock" if item.low_stock else ""
+            if self.row_tags.get(iid) != tag:
+                self.table.item(iid, tags=(tag,))
+                self.row_tags[iid] = tag
+        self.dirty_ids.clear()
 
     def check_all_thresholds(self):
         # if any item is at or below threshold, show a single alert
-        low_items = [item for item in self.manager.items.values() if item.needs_reorder()]
-        if low_items:
-            names = ", ".join(f"{i.name} (qty {i.quantity}, thr {i.threshold})" for i in low_items)
+        low_items = (item for item in self.manager.items.values() if item.low_stock)
+        shown = list(islice(low_items, ALERT_MAX_ITEMS))
+        if shown:
+            names = "\n".join(f"{i.name} (qty {i.quantity}, thr {i.threshold})" for i in shown)
+            more = sum(1 for _ in low_items)
+            if more:
+                names += f"\n... and {more} more"
             messagebox.showwarning("Low Stock Alert", f"The following items are at or below threshold:\n{names}")
 
     def perform_search(self, event=None):
+        # restart the countdown on every keystroke
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DELAY_MS, self.do_search)
+
+    def do_search(self):
+        self.search_after_id = None
         field = self.search_field.get()
         text = self.search_entry.get()
 
@@ -520,19 +837,41 @@ class InventoryGUI:
             self.load_table()
             return
 
-        results = self.manager.search(field, text)
-        self.load_table(results)
+        self.load_table(self.manager.search(field, text))
 
     def sort_group(self):
         sorted_items = self.manager.sort_by_group()
-        self.load_table(sorted_items)
+        if len(self.row_iid_by_id) != len(sorted_items):
+            # a search is narrowing the table: rows have to come back, so do a full reload
+            self.load_table(sorted_items)
+            return
+
+        # every row is already shown and up to date: just reorder them, no value or tag writes
+        self.flush_pending_rows()
+        order = [self.row_iid_by_id[item.id] for item in sorted_items]
+        if order != self.row_order:
+            self.table.set_children("", *order)
+            self.row_order = order
 
  
+    def show_dialog(self, dialog):
+        # only a withdrawn dialog is cleared; one still open (or minimised) keeps what the user typed
+        if dialog.win.state() == "withdrawn":
+            dialog.reset()
+        dialog.win.deiconify()
+        dialog.win.lift()
+
     def open_add_window(self):
-        AddItemWindow(self.root, self.manager, self.load_table)
+        if self.add_win is None or not self.add_win.win.winfo_exists():
+            self.add_win = AddItemWindow(self.root, self.manager, self.load_table)
+        else:
+            self.show_dialog(self.add_win)
 
     def open_order_window(self):
-        OrderWindow(self.root, self.manager, self.order_manager, self.after_order)
+        if self.order_win is None or not self.order_win.win.winfo_exists():
+            self.order_win = OrderWindow(self.root, self.manager, self.order_manager, self.after_order)
+        else:
+            self.show_dialog(self.order_win)
 
     def after_order(self):
         # reload table and re-check thresholds after an order updates stock
@@ -540,7 +879,10 @@ class InventoryGUI:
         self.check_all_thresholds()
 
     def open_update_window(self):
-        UpdateStockWindow(self.root, self.manager, self.load_table)
+        if self.update_win is None or not self.update_win.win.winfo_exists():
+            self.update_win = UpdateStockWindow(self.root, self.manager, self.load_table)
+        else:
+            self.show_dialog(self.update_win)
 
 
     def delete_selected(self):
@@ -552,13 +894,11 @@ class InventoryGUI:
 
         # for now, delete only the first selected row
         row_id = selected_items[0]
-        values = self.table.item(row_id)["values"]
-        if not values:
+        item_id = self.item_id_by_iid.get(row_id)
+        if item_id is None:
             messagebox.showerror("Error", "Could not read selected item")
             return
 
-        item_id = values[0]
-
         # optional confirmation
         if not messagebox.askyesno("Confirm Delete", f"Delete item '{item_id}'?"):
             return
@@ -569,6 +909,12 @@ class InventoryGUI:
             self.check_all_thresholds()
 
 
+    def on_close(self):
+        # write any debounced stock edits before the window goes away
+        self.manager.flush()
+        self.root.destroy()
+
+
 
 # Run App
 